@@ -0,0 +1,180 @@
+"""
+Benchmark GameState player records: the original five-key dicts against the
+slotted PlayerRecord objects.
+
+DictGameState below is GameState with the pre-PlayerRecord record handling
+(dict records, item access) and everything else - lock, leaderboard index,
+version bumps - unchanged, so the two differ only in the record type. For
+each player count it reports the memory held per player (tracemalloc, whole
+game state) and apply_hit throughput on a stream of random enemy, friendly
+and base hits.
+
+Run from the repository root:
+
+    python -m backend.bench_records                            # 30, 1000 and 100000 players
+    python -m backend.bench_records --players 1000 --hits 500000
+"""
+import argparse
+import gc
+import logging
+import random
+import time
+import tracemalloc
+from bisect import bisect_left, insort
+
+from backend.config import GAME_CONFIG, GAME_CODES
+from backend.game_state import (GameState, HitResult, HIT_BASE, HIT_ENEMY, HIT_FRIENDLY, HIT_OWN_BASE,
+                                HIT_UNKNOWN)
+
+logger = logging.getLogger('backend.game_state')
+
+
+class DictGameState(GameState):
+    """GameState storing players as {player_id, codename, team, score, hit_base} dicts."""
+
+    def _register(self, equipment_id, player_id, codename, team):
+        previous = self.players.get(equipment_id)
+        if previous:
+            self.team_totals[previous['team']] -= previous['score']
+            self.team_counts[previous['team']] -= 1
+            self._unindex(equipment_id, previous)
+
+        self.players[equipment_id] = {
+            'player_id': player_id,
+            'codename': codename,
+            'team': team,
+            'score': 0,
+            'hit_base': False
+        }
+        self.team_totals.setdefault(team, 0)
+        self.team_counts[team] = self.team_counts.get(team, 0) + 1
+        insort(self.team_index.setdefault(team, []), (0, equipment_id))
+
+    def apply_hit(self, transmitting_id, hit_id):
+        red_base = GAME_CODES['red_base_scored']
+        green_base = GAME_CODES['green_base_scored']
+
+        with self.lock:
+            attacker = self.players.get(transmitting_id)
+            attacker_name = attacker['codename'] if attacker else f"Player {transmitting_id}"
+
+            if hit_id == red_base or hit_id == green_base:
+                scoring_team = 'green' if hit_id == red_base else 'red'
+                if attacker and attacker['team'] == scoring_team:
+                    points = GAME_CONFIG['base_score_points']
+                    self._adjust_score(transmitting_id, points)
+                    attacker['hit_base'] = True
+                    self._bump(transmitting_id)
+                    result = HitResult(HIT_BASE, transmitting_id, attacker_name, hit_id, None, points, (hit_id,))
+                else:
+                    result = HitResult(HIT_OWN_BASE, transmitting_id, attacker_name, hit_id, None, 0, ())
+            else:
+                victim = self.players.get(hit_id)
+                victim_name = victim['codename'] if victim else f"Player {hit_id}"
+
+                if attacker and victim and attacker['team'] == victim['team']:
+                    points = GAME_CONFIG['points_penalty']
+                    self._adjust_score(transmitting_id, points)
+                    self._adjust_score(hit_id, points)
+                    self._bump(transmitting_id, hit_id)
+                    result = HitResult(HIT_FRIENDLY, transmitting_id, attacker_name, hit_id, victim_name,
+                                       points, (transmitting_id, hit_id))
+                else:
+                    points = GAME_CONFIG['points_per_hit'] if attacker else 0
+                    if attacker:
+                        self._adjust_score(transmitting_id, points)
+                        self._bump(transmitting_id)
+                    kind = HIT_ENEMY if attacker and victim else HIT_UNKNOWN
+                    result = HitResult(kind, transmitting_id, attacker_name, hit_id, victim_name, points, (hit_id,))
+
+        logger.debug(f"Hit {transmitting_id}->{hit_id}: {result.kind} ({result.points} points)")
+        return result
+
+    def _adjust_score(self, equipment_id, points):
+        player = self.players[equipment_id]
+        if points:
+            self._unindex(equipment_id, player)
+            player['score'] += points
+            insort(self.team_index[player['team']], (-player['score'], equipment_id))
+            self.team_totals[player['team']] += points
+        return player['score']
+
+    def _unindex(self, equipment_id, player):
+        index = self.team_index[player['team']]
+        del index[bisect_left(index, (-player['score'], equipment_id))]
+
+
+IMPLEMENTATIONS = (("dict", DictGameState), ("record", GameState))
+
+
+def build(state_class, players):
+    state = state_class()
+    state.add_players((equipment_id, equipment_id, f"Player {equipment_id}",
+                       'red' if equipment_id % 2 else 'green') for equipment_id in range(1, players + 1))
+    return state
+
+
+def measure_memory(state_class, players):
+    """Bytes held per player by a freshly built game state."""
+    gc.collect()
+    tracemalloc.start()
+    state = build(state_class, players)
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del state
+    return held / players
+
+
+def hit_stream(players, count, seed=7):
+    """Random (attacker, target) pairs: mostly player-on-player, some base codes."""
+    rng = random.Random(seed)
+    bases = (GAME_CODES['red_base_scored'], GAME_CODES['green_base_scored'])
+    stream = []
+    for _ in range(count):
+        attacker = rng.randint(1, players)
+        target = rng.choice(bases) if rng.random() < 0.05 else rng.randint(1, players)
+        stream.append((attacker, target))
+    return stream
+
+
+def measure_hits(state_class, players, hits):
+    """apply_hit calls per second on a freshly built game state, plus the final team totals."""
+    state = build(state_class, players)
+    apply_hit = state.apply_hit
+    stream = hit_stream(players, hits)
+    gc.collect()
+    started = time.perf_counter()
+    for attacker, target in stream:
+        apply_hit(attacker, target)
+    elapsed = time.perf_counter() - started
+    return hits / elapsed, state.team_totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dict vs PlayerRecord player records in GameState")
+    parser.add_argument("--players", type=int, nargs="+", default=[30, 1000, 100000])
+    parser.add_argument("--hits", type=int, default=200000, help="apply_hit calls per run")
+    parser.add_argument("--repeat", type=int, default=3, help="throughput runs per case (best is reported)")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    for players in args.players:
+        # Interleave the throughput runs so machine noise hits both implementations alike
+        runs = {name: [] for name, _ in IMPLEMENTATIONS}
+        for _ in range(args.repeat):
+            for name, state_class in IMPLEMENTATIONS:
+                runs[name].append(measure_hits(state_class, players, args.hits))
+        totals = [runs[name][0][1] for name, _ in IMPLEMENTATIONS]
+        assert totals[0] == totals[1], "both implementations must score the same hits identically"
+        results = {name: (measure_memory(state_class, players), max(rate for rate, _ in runs[name]))
+                   for name, state_class in IMPLEMENTATIONS}
+        for name, (bytes_per_player, hits_per_second) in results.items():
+            print(f"{players:>7} players  {name:>6}: {bytes_per_player:7.0f} bytes/player, "
+                  f"{hits_per_second:9.0f} hits/s")
+        (dict_bytes, dict_rate), (record_bytes, record_rate) = results['dict'], results['record']
+        print(f"{players:>7} players  change: {100 * (record_bytes - dict_bytes) / dict_bytes:+.0f}% memory, "
+              f"{100 * (record_rate - dict_rate) / dict_rate:+.0f}% hits/s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,159 @@
+"""
+Load test for GET /game/state: N displays polling during a busy game.
+
+A child process runs the Flask app (threaded werkzeug server) and feeds hits
+straight into process_received_udp_data at a fixed rate; this process runs
+the displays, each on its own keep-alive session. Every mode reports
+requests/sec, request latency and the server process's total CPU time (hit feed included).
+
+Modes:
+    uncached  rebuild and re-serialize the scoreboard on every request (pre-cache behaviour)
+    cached    serve the shared per-version snapshot body
+    etag      cached, and displays send If-None-Match (304 when nothing changed)
+
+Run from the repository root:
+
+    python -m backend.bench_state                               # 20 displays at 2 Hz, 500 hits/s
+    python -m backend.bench_state --poll-rate 0 --duration 5    # displays poll flat out
+"""
+import argparse
+import json
+import logging
+import random
+import subprocess
+import sys
+import threading
+import time
+
+import requests
+
+MODES = ("uncached", "cached", "etag")
+
+
+def serve(mode, hit_rate, duration):
+    """Child process: run the API with a synthetic game, then report CPU time used."""
+    from flask import jsonify
+    from werkzeug.serving import make_server
+    from backend import server
+
+    logging.disable(logging.INFO)
+    if mode == "uncached":
+        server.app.view_functions['get_game_state'] = lambda: jsonify(server.game_state.get_scoreboard())
+
+    for equipment_id in range(1, 31):
+        server.game_state.add_player(equipment_id, equipment_id, f"Player {equipment_id}",
+                                     'red' if equipment_id <= 15 else 'green')
+    server.game_state.start_game()
+
+    http = make_server('127.0.0.1', 0, server.app, threaded=True)
+    threading.Thread(target=http.serve_forever, daemon=True).start()
+    print(http.server_port, flush=True)
+
+    sys.stdin.readline()  # parent says go
+    started = time.perf_counter()
+    cpu_started = time.process_time()
+    rng = random.Random(7)
+    hits = 0
+    while time.perf_counter() - started < duration:
+        delay = started + hits / hit_rate - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        server.process_received_udp_data(f"{rng.randint(1, 15)}:{rng.randint(16, 30)}")
+        hits += 1
+    print(json.dumps({'cpu_seconds': time.process_time() - cpu_started, 'hits': hits,
+                      'version': server.game_state.version}), flush=True)
+    sys.stdin.readline()  # keep serving until the displays have finished
+
+
+def run_displays(port, displays, poll_rate, duration, use_etag):
+    url = f"http://127.0.0.1:{port}/game/state"
+    latencies = []
+    not_modified = [0]
+    errors = [0]
+    lock = threading.Lock()
+    started = time.perf_counter()
+
+    def display(index):
+        session = requests.Session()
+        etag = None
+        i = 0
+        # Stagger the displays across one poll interval
+        offset = index / (displays * poll_rate) if poll_rate else 0
+        while True:
+            if poll_rate:
+                delay = started + offset + i / poll_rate - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            if time.perf_counter() - started >= duration:
+                return
+            headers = {'If-None-Match': etag} if etag else None
+            sent = time.perf_counter()
+            try:
+                response = session.get(url, headers=headers)
+            except requests.RequestException:
+                with lock:
+                    errors[0] += 1
+                continue
+            elapsed = (time.perf_counter() - sent) * 1000
+            if response.status_code == 200:
+                response.json()
+            if use_etag:
+                etag = response.headers.get('ETag', etag)
+            with lock:
+                latencies.append(elapsed)
+                if response.status_code == 304:
+                    not_modified[0] += 1
+            i += 1
+
+    threads = [threading.Thread(target=display, args=(i,), daemon=True) for i in range(displays)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    latencies.sort()
+    return latencies, not_modified[0], errors[0], time.perf_counter() - started
+
+
+def bench(mode, args):
+    child = subprocess.Popen([sys.executable, "-m", "backend.bench_state", "--serve", mode,
+                              "--hit-rate", str(args.hit_rate), "--duration", str(args.duration)],
+                             stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+    port = int(child.stdout.readline())
+    child.stdin.write("go\n")
+    child.stdin.flush()
+
+    latencies, not_modified, errors, elapsed = run_displays(port, args.displays, args.poll_rate, args.duration,
+                                                            use_etag=(mode == "etag"))
+    server_stats = json.loads(child.stdout.readline())
+    child.stdin.write("done\n")
+    child.stdin.flush()
+    child.wait(timeout=5)
+
+    count = len(latencies)
+    p50 = latencies[count // 2] if count else 0.0
+    p99 = latencies[min(count - 1, int(count * 0.99))] if count else 0.0
+    print(f"{mode:>8}: {count} requests in {elapsed:.1f} s = {count / elapsed:.0f} req/s "
+          f"({not_modified} x 304, {errors} errors), latency p50 {p50:.2f} ms / p99 {p99:.2f} ms, "
+          f"server CPU {server_stats['cpu_seconds']:.2f} s "
+          f"({server_stats['hits']} hits, {server_stats['version']} state versions)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark GET /game/state under display load")
+    parser.add_argument("--mode", choices=MODES + ("all",), default="all")
+    parser.add_argument("--displays", type=int, default=20)
+    parser.add_argument("--poll-rate", type=float, default=2.0, help="polls per second per display (0 = flat out)")
+    parser.add_argument("--hit-rate", type=float, default=500.0, help="hits per second fed into the game")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per mode")
+    parser.add_argument("--serve", choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.serve, args.hit_rate, args.duration)
+        return
+    for mode in (MODES if args.mode == "all" else (args.mode,)):
+        bench(mode, args)
+
+
+if __name__ == '__main__':
+    main()
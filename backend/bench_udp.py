@@ -0,0 +1,155 @@
+"""
+Loopback benchmark for the two UDP engines (receiver thread vs asyncio).
+
+Sends hits to the receive port (7501) and listens on the broadcast port
+(7500) for the equipment ID the server sends back for each one. Every hit
+targets its own equipment ID, so each broadcast maps to exactly one hit and
+its hit-to-broadcast latency. Reports packets/sec and p50/p99/max latency.
+
+Run from the repository root (nothing else may be using ports 7500/7501):
+
+    python -m backend.bench_udp                      # both engines, 20000 hits each
+    python -m backend.bench_udp --engine asyncio --count 50000 --rate 5000
+"""
+import argparse
+import logging
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+FIRST_TARGET_ID = 1000  # hit IDs start here (clear of the 43/53/202/221 codes)
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+def start_engine(server, engine):
+    """Start the chosen receive path inside this process, the same way start_server does."""
+    if engine == 'asyncio':
+        server.udp_engine = server.UdpEngine(server.process_received_udp_data, server.receive_port,
+                                             server.broadcast_port,
+                                             receive_buffer_bytes=server.UDP_CONFIG['receive_buffer_bytes'])
+        if not server.udp_engine.start():
+            raise RuntimeError("asyncio UDP engine failed to start")
+    else:
+        if not server.setup_udp_sockets():
+            raise RuntimeError("UDP sockets could not be set up")
+        threading.Thread(target=server.udp_receiver_thread, daemon=True).start()
+    server.broadcast_scheduler.start()
+
+
+def run(engine, count, rate, settle):
+    from backend import server
+
+    # Two registered attackers; every target ID is unregistered, which still broadcasts the target
+    server.game_state.add_player(1, 1, "Bench Red", "red")
+    server.game_state.add_player(2, 2, "Bench Green", "green")
+
+    listener = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    listener.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 8 * 1024 * 1024)
+    listener.bind(('127.0.0.1', server.broadcast_port))
+    listener.settimeout(0.2)
+
+    start_engine(server, engine)
+
+    sent_at = {}
+    latencies = []
+    received_at = []
+
+    def receive():
+        while True:
+            try:
+                data, _ = listener.recvfrom(64)
+            except socket.timeout:
+                if done.is_set():
+                    return
+                continue
+            now = time.perf_counter()
+            try:
+                started = sent_at.pop(int(data))
+            except (ValueError, KeyError):
+                continue  # not one of ours
+            latencies.append((now - started) * 1000)
+            received_at.append(now)
+
+    done = threading.Event()
+    receiver = threading.Thread(target=receive, daemon=True)
+    receiver.start()
+
+    sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    target = ('127.0.0.1', server.receive_port)
+    first_send = time.perf_counter()
+    for i in range(count):
+        if rate:
+            # Pace against the schedule (not per-packet sleeps) so the offered rate is exact
+            delay = first_send + i / rate - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        hit_id = FIRST_TARGET_ID + i
+        attacker = 1 + (i & 1)
+        sent_at[hit_id] = time.perf_counter()
+        sender.sendto(f"{attacker}:{hit_id}".encode(), target)
+    last_send = time.perf_counter()
+
+    # Wait for stragglers
+    deadline = time.perf_counter() + settle
+    while sent_at and time.perf_counter() < deadline:
+        time.sleep(0.05)
+    done.set()
+    receiver.join()
+
+    latencies.sort()
+    elapsed = (received_at[-1] if received_at else last_send) - first_send
+    return {
+        'engine': engine,
+        'sent': count,
+        'offered_pps': round(count / (last_send - first_send)),
+        'received': len(latencies),
+        'lost': count - len(latencies),
+        'throughput_pps': round(len(latencies) / elapsed) if elapsed > 0 else 0,
+        'p50_ms': round(percentile(latencies, 0.50), 3),
+        'p99_ms': round(percentile(latencies, 0.99), 3),
+        'max_ms': round(latencies[-1], 3) if latencies else 0.0,
+        'kernel_drops': server.read_kernel_udp_drops(server.receive_port)
+    }
+
+
+def print_result(result):
+    print(f"{result['engine']:>8}: sent {result['sent']} (offered {result['offered_pps']} pkt/s), "
+          f"received {result['received']}, lost {result['lost']}, "
+          f"throughput {result['throughput_pps']} pkt/s, "
+          f"latency p50 {result['p50_ms']} ms / p99 {result['p99_ms']} ms / max {result['max_ms']} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the UDP receive/broadcast path over loopback")
+    parser.add_argument("--engine", choices=["thread", "asyncio", "both"], default="both")
+    parser.add_argument("--count", type=int, default=20000, help="hits to send per engine")
+    parser.add_argument("--rate", type=float, default=0, help="hits per second (0 = as fast as possible)")
+    parser.add_argument("--settle", type=float, default=3.0, help="seconds to wait for late broadcasts")
+    parser.add_argument("--log", action="store_true", help="keep the server's per-hit INFO logging on")
+    args = parser.parse_args()
+
+    if args.engine == "both":
+        # Each engine gets a fresh process so the ports and the game state start clean
+        for engine in ("thread", "asyncio"):
+            command = [sys.executable, "-m", "backend.bench_udp", "--engine", engine, "--count", str(args.count),
+                       "--rate", str(args.rate), "--settle", str(args.settle)]
+            if args.log:
+                command.append("--log")
+            subprocess.run(command, check=False)
+        return
+
+    if not args.log:
+        logging.disable(logging.INFO)
+    print_result(run(args.engine, args.count, args.rate, args.settle))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+import heapq
+import itertools
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class BroadcastScheduler:
+    """
+    Queue of outbound UDP broadcasts with timed spacing rules.
+    Callers (the hit processor, HTTP handlers) only enqueue; a single
+    worker thread sends each broadcast when it is due, so spacing delays
+    never block ingest or request handling.
+    """
+
+    def __init__(self, sender):
+        """
+        Args:
+            sender: Callable that performs one broadcast, e.g. broadcast_equipment_id.
+                    Must return True on success.
+        """
+        self.sender = sender
+        self.condition = threading.Condition()
+        self.queue = []  # heap of (due_time, sequence, code)
+        self._sequence = itertools.count()
+        self.thread = None
+        self.stats = {
+            'enqueued': 0,
+            'sent': 0,
+            'failed': 0,
+            'last_lag_ms': 0.0,
+            'max_lag_ms': 0.0,
+            'total_lag_ms': 0.0,
+            'last_failed_code': None,  # most recent broadcast that could not be sent
+            'last_failed_at': None  # wall-clock time of that failure
+        }
+
+    def start(self):
+        """Start the worker thread (no-op if it is already running)."""
+        with self.condition:
+            if self.thread and self.thread.is_alive():
+                return
+            self.thread = threading.Thread(target=self._run, daemon=True, name="broadcast-scheduler")
+            self.thread.start()
+            logger.info("Broadcast scheduler started")
+
+    def send(self, code, delay=0.0):
+        """
+        Schedule a single broadcast.
+
+        Args:
+            code: Equipment ID or game code to broadcast
+            delay: Seconds from now before it is sent
+        """
+        self._enqueue([(time.monotonic() + delay, code)])
+
+    def send_sequence(self, codes, spacing):
+        """
+        Schedule broadcasts in order, each `spacing` seconds after the previous one
+        (e.g. friendly fire: attacker, then victim 50 ms later).
+        """
+        now = time.monotonic()
+        self._enqueue([(now + i * spacing, code) for i, code in enumerate(codes)])
+
+    def repeat(self, code, times, interval):
+        """Schedule `code` to be broadcast `times` times, `interval` seconds apart."""
+        self.send_sequence([code] * times, interval)
+
+    def queue_depth(self):
+        """Number of broadcasts waiting to be sent"""
+        with self.condition:
+            return len(self.queue)
+
+    def get_stats(self):
+        """
+        Get queue metrics.
+
+        Returns:
+            dict: Counters plus current queue depth and average send lag
+        """
+        with self.condition:
+            stats = dict(self.stats)
+            stats['queue_depth'] = len(self.queue)
+        sent = stats['sent'] + stats['failed']
+        stats['average_lag_ms'] = round(stats.pop('total_lag_ms') / sent, 3) if sent else 0.0
+        return stats
+
+    def _enqueue(self, entries):
+        if not self.thread or not self.thread.is_alive():
+            self.start()
+        with self.condition:
+            for due, code in entries:
+                heapq.heappush(self.queue, (due, next(self._sequence), code))
+            self.stats['enqueued'] += len(entries)
+            self.condition.notify()
+
+    def _run(self):
+        while True:
+            with self.condition:
+                while True:
+                    if not self.queue:
+                        self.condition.wait()
+                        continue
+                    due = self.queue[0][0]
+                    wait = due - time.monotonic()
+                    if wait <= 0:
+                        break
+                    self.condition.wait(wait)
+                due, _, code = heapq.heappop(self.queue)
+
+            try:
+                ok = self.sender(code)
+            except Exception as e:
+                logger.error(f"Scheduled broadcast of {code} failed: {e}")
+                ok = False
+
+            lag_ms = (time.monotonic() - due) * 1000
+            with self.condition:
+                self.stats['sent' if ok else 'failed'] += 1
+                if not ok:
+                    self.stats['last_failed_code'] = code
+                    self.stats['last_failed_at'] = time.time()
+                self.stats['last_lag_ms'] = round(lag_ms, 3)
+                self.stats['total_lag_ms'] += lag_ms
+                if lag_ms > self.stats['max_lag_ms']:
+                    self.stats['max_lag_ms'] = round(lag_ms, 3)
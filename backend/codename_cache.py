@@ -0,0 +1,137 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class CodenameCache:
+    """
+    Thread-safe LRU cache of player ID -> codename with per-entry expiry.
+    "Not in the database" is cached too (as None), with its own shorter TTL,
+    so repeated lookups of an unregistered ID don't hit PostgreSQL either.
+
+    Every invalidate()/clear() (and every write fill) advances a generation
+    counter. A read-through fill takes the generation before querying and
+    passes it to put(), which drops the result if the generation moved in
+    between, so a lookup that raced a rename or clear can't re-cache the
+    stale codename.
+    """
+
+    def __init__(self, max_size=1024, ttl=300.0, negative_ttl=30.0):
+        """
+        Args:
+            max_size (int): Entries kept before the least recently used is evicted
+            ttl (float): Seconds a found codename stays valid
+            negative_ttl (float): Seconds a "not found" result stays valid
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()  # player_id -> (codename or None, expires_at), LRU first
+        self.generation = 0  # bumped by every invalidate()/clear()
+        self.stats = {
+            'hits': 0,
+            'negative_hits': 0,
+            'misses': 0,
+            'evictions': 0,
+            'expirations': 0,
+            'invalidations': 0,
+            'stale_puts': 0
+        }
+
+    def get(self, player_id):
+        """
+        Look up a cached result.
+
+        Returns:
+            tuple: (found, codename) - found is False on a miss; codename may be
+            None on a hit, meaning the ID is known not to exist
+        """
+        with self.lock:
+            entry = self.entries.get(player_id)
+            if entry is None:
+                self.stats['misses'] += 1
+                return False, None
+
+            codename, expires_at = entry
+            if time.monotonic() >= expires_at:
+                del self.entries[player_id]
+                self.stats['expirations'] += 1
+                self.stats['misses'] += 1
+                return False, None
+
+            self.entries.move_to_end(player_id)
+            self.stats['hits' if codename is not None else 'negative_hits'] += 1
+            return True, codename
+
+    def token(self):
+        """Current generation; take it before the database query whose result goes to put()."""
+        with self.lock:
+            return self.generation
+
+    def put(self, player_id, codename, token=None):
+        """
+        Cache a lookup result (codename, or None for "not found"). With a token
+        from token(), the result is dropped if the cache was invalidated since.
+        """
+        ttl = self.ttl if codename is not None else self.negative_ttl
+        with self.lock:
+            if token is not None and token != self.generation:
+                self.stats['stale_puts'] += 1
+                return
+            self._store(player_id, codename, ttl)
+
+    def put_written(self, codenames, token):
+        """
+        Cache the codenames a database write just stored (player_id -> codename).
+        Advances the generation so lookups that read the old rows before the
+        write can't cache them afterwards; the write's own results are dropped
+        (and the entries forgotten) if the cache was invalidated while the
+        write was in flight.
+        """
+        with self.lock:
+            stale = token != self.generation
+            self.generation += 1
+            for player_id, codename in codenames.items():
+                if stale:
+                    self.entries.pop(player_id, None)
+                    self.stats['stale_puts'] += 1
+                else:
+                    self._store(player_id, codename, self.ttl)
+
+    def invalidate(self, player_id):
+        """Forget one ID."""
+        with self.lock:
+            self.generation += 1
+            if self.entries.pop(player_id, None) is not None:
+                self.stats['invalidations'] += 1
+
+    def clear(self):
+        """Forget everything (e.g. after the players table is cleared)."""
+        with self.lock:
+            self.generation += 1
+            self.stats['invalidations'] += len(self.entries)
+            self.entries.clear()
+
+    def get_stats(self):
+        """
+        Get cache metrics.
+
+        Returns:
+            dict: Counters plus current size and hit rate
+        """
+        with self.lock:
+            stats = dict(self.stats)
+            stats['size'] = len(self.entries)
+            stats['max_size'] = self.max_size
+        lookups = stats['hits'] + stats['negative_hits'] + stats['misses']
+        stats['hit_rate'] = round((stats['hits'] + stats['negative_hits']) / lookups, 3) if lookups else 0.0
+        return stats
+
+    def _store(self, player_id, codename, ttl):
+        """Insert an entry and evict down to max_size. Caller must hold the lock."""
+        self.entries[player_id] = (codename, time.monotonic() + ttl)
+        self.entries.move_to_end(player_id)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+            self.stats['evictions'] += 1
@@ -7,13 +7,30 @@ DATABASE_CONFIG = {
     "user": os.getenv("DB_USER", "student"),
     "password": os.getenv("DB_PASSWORD", "student"),    
     "port": int(os.getenv("DB_PORT", "5432")),
+    # Connection pool shared by the Flask request threads
+    "pool_min_size": int(os.getenv("DB_POOL_MIN", "1")),
+    "pool_max_size": int(os.getenv("DB_POOL_MAX", "10")),
+    "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT", "5")),  # seconds to wait for a free connection
+    "pool_validate_after": float(os.getenv("DB_POOL_VALIDATE_AFTER", "30")),  # ping connections idle longer than this
+    # In-process codename cache in front of get_player_by_id
+    "cache_size": int(os.getenv("DB_CACHE_SIZE", "1024")),
+    "cache_ttl": float(os.getenv("DB_CACHE_TTL", "300")),  # seconds a found codename is trusted
+    "cache_negative_ttl": float(os.getenv("DB_CACHE_NEGATIVE_TTL", "30")),  # seconds "not found" is trusted
 }
 
 # UDP Socket Configuration 
 UDP_CONFIG = {
     'broadcast_port': 7500,
     'receive_port': 7501,
-    'network_address': '127.0.0.1'  # localhost
+    'network_address': '127.0.0.1',  # localhost
+    'receive_buffer_bytes': 4 * 1024 * 1024,  # SO_RCVBUF requested for the receive socket
+    'max_batch_size': 512,  # max datagrams drained per wakeup
+    'max_datagram_bytes': 1024,
+    'engine': os.getenv("UDP_ENGINE", "thread"),  # 'thread' (receiver thread) or 'asyncio' (backend.udp_engine)
+    'friendly_fire_spacing_seconds': 0.05,  # attacker ID, then victim ID this long after
+    'roster_broadcast_spacing_seconds': 0.02,  # gap between equipment IDs from POST /players/batch
+    'game_end_repeats': 3,  # code 221 is broadcast this many times
+    'game_end_interval_seconds': 0.1
 }
 
 
@@ -1,8 +1,10 @@
-import psycopg2
 from psycopg2 import sql, Error
+from psycopg2.extras import execute_values
 import os
-from typing import Optional, List, Tuple
+from typing import Optional, List, Tuple, Dict, Iterable
 import logging
+from backend.db_pool import ConnectionPool
+from backend.codename_cache import CodenameCache
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -13,9 +15,14 @@ class LaserTagDatabase:
     """
     Database handler for the Laser Tag system.
     Manages player data in PostgreSQL database.
+    Every method checks a connection out of a thread-safe pool, so
+    concurrent Flask request threads never share a transaction.
+    Codename lookups go through an in-process LRU/TTL cache.
     """
     
-    def __init__(self, host="localhost", database="photon", user="postgres", password="", port=5432):
+    def __init__(self, host="localhost", database="photon", user="postgres", password="", port=5432,
+                 pool_min_size=1, pool_max_size=10, pool_timeout=5.0, pool_validate_after=30.0,
+                 cache_size=1024, cache_ttl=300.0, cache_negative_ttl=30.0):
         # Initialize database connection parameters
         self.connection_params = {
             'host': host,
@@ -24,17 +31,21 @@ class LaserTagDatabase:
             'password': password,
             'port': port
         }
-        self.connection = None
+        self.pool = ConnectionPool(self.connection_params, min_size=pool_min_size, max_size=pool_max_size,
+                                   checkout_timeout=pool_timeout, validate_after_seconds=pool_validate_after)
+        self.is_connected = False
+        self.codename_cache = CodenameCache(max_size=cache_size, ttl=cache_ttl, negative_ttl=cache_negative_ttl)
     
     def connect_to_db(self) -> bool:
         """
-        Establish connection to PostgreSQL database.
+        Open the connection pool (min_size connections) to the PostgreSQL database.
         
         Returns:
             bool: True if connection successful, False otherwise
         """
         try:
-            self.connection = psycopg2.connect(**self.connection_params)
+            self.pool.open()
+            self.is_connected = True
             logger.info("Successfully connected to PostgreSQL database")
             return True
         except Error as e:
@@ -42,32 +53,37 @@ class LaserTagDatabase:
             return False
     
     def disconnect_from_db(self):
-        """Close database connection."""
-        if self.connection:
-            self.connection.close()
-            logger.info("Database connection closed")
+        """Close all pooled database connections."""
+        self.pool.closeall()
+        self.is_connected = False
+        logger.info("Database connection closed")
+    
+    def get_pool_stats(self) -> dict:
+        """Get connection pool utilization stats."""
+        return self.pool.get_stats()
+    
+    def get_cache_stats(self) -> dict:
+        """Get codename cache hit/miss stats."""
+        return self.codename_cache.get_stats()
     
     def test_connection(self) -> bool:
         """
         Test database connectivity and table existence.
         """
         try:
-            if not self.connection or self.connection.closed:
-                if not self.connect_to_db():
-                    return False
-            
-            cursor = self.connection.cursor()
-            
-            # Test if players table exists
-            cursor.execute("""
-                SELECT EXISTS (
-                    SELECT FROM information_schema.tables 
-                    WHERE table_name = 'players'
-                );
-            """)
+            if not self.is_connected and not self.connect_to_db():
+                return False
             
-            table_exists = cursor.fetchone()[0]
-            cursor.close()
+            with self.pool.connection() as conn, conn.cursor() as cursor:
+                # Test if players table exists
+                cursor.execute("""
+                    SELECT EXISTS (
+                        SELECT FROM information_schema.tables 
+                        WHERE table_name = 'players'
+                    );
+                """)
+                
+                table_exists = cursor.fetchone()[0]
             
             if table_exists:
                 logger.info("Database connection test successful - players table found")
@@ -88,105 +104,227 @@ class LaserTagDatabase:
         Returns:
             Optional[str]: Player codename if found, None otherwise
         """
+        found, codename = self.codename_cache.get(player_id)
+        if found:
+            return codename
+        
+        token = self.codename_cache.token()
         try:
-            if not self.connection or self.connection.closed:
-                if not self.connect_to_db():
-                    return None
+            if not self.is_connected and not self.connect_to_db():
+                return None
             
-            cursor = self.connection.cursor()
-            cursor.execute("SELECT codename FROM players WHERE id = %s", (player_id,))
-            result = cursor.fetchone()
-            cursor.close()
+            with self.pool.connection() as conn, conn.cursor() as cursor:
+                cursor.execute("SELECT codename FROM players WHERE id = %s", (player_id,))
+                result = cursor.fetchone()
             
-            if result:
-                codename = result[0]
+            codename = result[0] if result else None
+            self.codename_cache.put(player_id, codename, token)  # "not found" is cached too
+            if codename:
                 logger.info(f"Found player ID {player_id}: {codename}")
-                return codename
             else:
                 logger.info(f"Player ID {player_id} not found in database")
-                return None
+            return codename
                 
         except Error as e:
             logger.error(f"Error retrieving player {player_id}: {e}")
             return None
     
-    def add_player(self, player_id: int, codename: str) -> bool:
-       #adds a player to the database   
+    def upsert_player(self, player_id: int, codename: str, rename: bool = True) -> Optional[str]:
+        """
+        Register a player, or handle an existing one, in a single round trip
+        (INSERT ... ON CONFLICT (id) DO UPDATE ... RETURNING).
+        Args:
+            player_id (int): Player ID
+            codename (str): Codename for a new player (or the new name when renaming)
+            rename (bool): If the ID already exists, overwrite its codename (True)
+                           or keep the stored one (False)
+        Returns:
+            Optional[str]: The codename now stored for the ID, None on failure
+        """
         try:
             if len(codename) > 30:
                 logger.error(f"Codename too long: {codename}")
-                return False
+                return None
             
             if not codename.strip():
                 logger.error("Codename is empty")
-                return False
-            
-            if not self.connection or self.connection.closed:
-                if not self.connect_to_db():
-                    return False
-            
-            cursor = self.connection.cursor()
+                return None
             
-            # Check if player already exists
-            existing_codename = self.get_player_by_id(player_id)
+            if not self.is_connected and not self.connect_to_db():
+                return None
             
-            if existing_codename:
-                # Update existing player
+            # DO UPDATE (not DO NOTHING) so RETURNING also yields the row when it already existed;
+            # xmax = 0 only for a freshly inserted row
+            on_conflict = "EXCLUDED.codename" if rename else "players.codename"
+            token = self.codename_cache.token()
+            with self.pool.connection() as conn, conn.cursor() as cursor:
                 cursor.execute(
-                    "UPDATE players SET codename = %s WHERE id = %s",
-                    (codename.strip(), player_id)
-                )
-                logger.info(f"Updated player {player_id}: {codename}")
-            else:
-                cursor.execute(
-                    "INSERT INTO players (id, codename) VALUES (%s, %s)",
+                    f"""
+                    INSERT INTO players (id, codename) VALUES (%s, %s)
+                    ON CONFLICT (id) DO UPDATE SET codename = {on_conflict}
+                    RETURNING codename, (xmax = 0) AS inserted
+                    """,
                     (player_id, codename.strip())
                 )
-                logger.info(f"Added player {player_id}: {codename}")
+                stored_codename, inserted = cursor.fetchone()
+            self.codename_cache.put_written({player_id: stored_codename}, token)
             
-            self.connection.commit()
-            cursor.close()
-            return True
+            if inserted:
+                logger.info(f"Added player {player_id}: {stored_codename}")
+            elif rename:
+                logger.info(f"Updated player {player_id}: {stored_codename}")
+            else:
+                logger.info(f"Player {player_id} already exists as {stored_codename}")
+            return stored_codename
             
         except Error as e:
+            # The pool rolls back the failed transaction when the connection is returned
             logger.error(f"Error adding player {player_id} ({codename}): {e}")
-            if self.connection:
-                self.connection.rollback()
-            return False
+            self.codename_cache.invalidate(player_id)  # the write may or may not have landed
+            return None
+    
+    def upsert_players(self, players: Iterable[Tuple[int, Optional[str]]], rename: bool = False) -> Optional[Dict[int, Tuple[str, bool]]]:
+        """
+        Register a whole roster in one transaction: a single multi-row upsert for
+        entries with a codename plus a single lookup for entries without one.
+        Args:
+            players: (player_id, codename) pairs; codename may be None/empty to
+                     only resolve an existing player
+            rename (bool): Overwrite the codename of IDs that already exist
+        Returns:
+            Optional[Dict[int, Tuple[str, bool]]]: player_id -> (codename, inserted) for every
+            ID registered or found (IDs without a codename that don't exist are left out),
+            None on failure (nothing is written)
+        """
+        new_rows = {}  # player_id -> codename (the last entry for an ID wins)
+        lookup_ids = set()
+        for player_id, codename in players:
+            if codename and codename.strip():
+                new_rows[player_id] = codename.strip()
+            else:
+                lookup_ids.add(player_id)
+        lookup_ids -= new_rows.keys()
+        
+        results = {}
+        for player_id in list(lookup_ids):
+            found, codename = self.codename_cache.get(player_id)
+            if found:
+                lookup_ids.discard(player_id)
+                if codename:
+                    results[player_id] = (codename, False)
+        
+        if not new_rows and not lookup_ids:
+            return results
+        
+        try:
+            if not self.is_connected and not self.connect_to_db():
+                return None
+            
+            on_conflict = "EXCLUDED.codename" if rename else "players.codename"
+            token = self.codename_cache.token()
+            with self.pool.transaction() as conn, conn.cursor() as cursor:
+                if new_rows:
+                    rows = execute_values(
+                        cursor,
+                        f"""
+                        INSERT INTO players (id, codename) VALUES %s
+                        ON CONFLICT (id) DO UPDATE SET codename = {on_conflict}
+                        RETURNING id, codename, (xmax = 0) AS inserted
+                        """,
+                        list(new_rows.items()),
+                        fetch=True
+                    )
+                    for player_id, codename, inserted in rows:
+                        results[player_id] = (codename, inserted)
+                if lookup_ids:
+                    cursor.execute("SELECT id, codename FROM players WHERE id = ANY(%s)", (list(lookup_ids),))
+                    for player_id, codename in cursor.fetchall():
+                        results[player_id] = (codename, False)
+            
+            for player_id in lookup_ids:
+                self.codename_cache.put(player_id, results[player_id][0] if player_id in results else None, token)
+            self.codename_cache.put_written({player_id: results[player_id][0] for player_id in new_rows}, token)
+            added = sum(1 for _, inserted in results.values() if inserted)
+            logger.info(f"Registered roster of {len(new_rows) + len(lookup_ids)} players ({added} new)")
+            return results
+            
+        except Error as e:
+            logger.error(f"Error registering roster: {e}")
+            for player_id in new_rows:
+                self.codename_cache.invalidate(player_id)
+            return None
+    
+    def get_players_by_ids(self, player_ids: Iterable[int]) -> Optional[List[Tuple[int, str]]]:
+        """
+        Retrieve codenames for many IDs: cached ones first, the rest in a single
+        WHERE id = ANY(...) query.
+        Args:
+            player_ids: IDs to look up
+        Returns:
+            Optional[List[Tuple[int, str]]]: (id, codename) for every ID that exists,
+            ordered by id; None on failure
+        """
+        results = {}
+        misses = []
+        for player_id in set(player_ids):
+            found, codename = self.codename_cache.get(player_id)
+            if not found:
+                misses.append(player_id)
+            elif codename:
+                results[player_id] = codename
+        
+        if misses:
+            token = self.codename_cache.token()
+            try:
+                if not self.is_connected and not self.connect_to_db():
+                    return None
+                
+                with self.pool.connection() as conn, conn.cursor() as cursor:
+                    cursor.execute("SELECT id, codename FROM players WHERE id = ANY(%s)", (misses,))
+                    rows = cursor.fetchall()
+                
+                results.update(rows)
+                for player_id in misses:
+                    self.codename_cache.put(player_id, results.get(player_id), token)  # "not found" is cached too
+                logger.info(f"Looked up {len(misses)} player IDs in database ({len(rows)} found)")
+                
+            except Error as e:
+                logger.error(f"Error retrieving players {misses}: {e}")
+                return None
+        
+        return sorted(results.items())
+    
+    def add_player(self, player_id: int, codename: str) -> bool:
+       #adds a player to the database, or renames an existing one
+        return self.upsert_player(player_id, codename) is not None
     
     def clear_all_players(self) -> bool:
         """Remove all players from database (F12 functionality)."""
         try:
-            if not self.connection or self.connection.closed:
-                if not self.connect_to_db():
-                    return False
+            if not self.is_connected and not self.connect_to_db():
+                return False
             
-            cursor = self.connection.cursor()
-            cursor.execute("DELETE FROM players")
-            rows_deleted = cursor.rowcount
-            self.connection.commit()
-            cursor.close()
+            with self.pool.connection() as conn, conn.cursor() as cursor:
+                cursor.execute("DELETE FROM players")
+                rows_deleted = cursor.rowcount
+            self.codename_cache.clear()
             
             logger.info(f"Cleared all players from database ({rows_deleted} rows deleted)")
             return True
             
         except Error as e:
             logger.error(f"Error clearing players: {e}")
-            if self.connection:
-                self.connection.rollback()
             return False
     
     def get_all_players(self) -> List[Tuple[int, str]]:
         """Retrieve all players from database."""
         try:
-            if not self.connection or self.connection.closed:
-                if not self.connect_to_db():
-                    return []
+            if not self.is_connected and not self.connect_to_db():
+                return []
             
-            cursor = self.connection.cursor()
-            cursor.execute("SELECT id, codename FROM players ORDER BY id")
-            results = cursor.fetchall()
-            cursor.close()
+            with self.pool.connection() as conn, conn.cursor() as cursor:
+                cursor.execute("SELECT id, codename FROM players ORDER BY id")
+                results = cursor.fetchall()
             
             logger.info(f"Retrieved {len(results)} players from database")
             return results
@@ -198,14 +336,12 @@ class LaserTagDatabase:
     def get_player_count(self) -> int:
        
         try:
-            if not self.connection or self.connection.closed:
-                if not self.connect_to_db():
-                    return 0
+            if not self.is_connected and not self.connect_to_db():
+                return 0
             
-            cursor = self.connection.cursor()
-            cursor.execute("SELECT COUNT(*) FROM players")
-            count = cursor.fetchone()[0]
-            cursor.close()
+            with self.pool.connection() as conn, conn.cursor() as cursor:
+                cursor.execute("SELECT COUNT(*) FROM players")
+                count = cursor.fetchone()[0]
             
             return count
             
@@ -215,7 +351,7 @@ class LaserTagDatabase:
 
 
 # Convenience functions for easy integration
-def create_database_connection(host="localhost", database="photon", user="postgres", password=""):
+def create_database_connection(host="localhost", database="photon", user="postgres", password="", **pool_options):
     
-    db = LaserTagDatabase(host=host, database=database, user=user, password=password)
+    db = LaserTagDatabase(host=host, database=database, user=user, password=password, **pool_options)
     return db
@@ -0,0 +1,259 @@
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import psycopg2
+from psycopg2 import Error, extensions
+
+logger = logging.getLogger(__name__)
+
+
+class PoolTimeout(Error):
+    """No connection became free within the checkout timeout."""
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of psycopg2 connections shared by the Flask request
+    threads. Connections are opened on demand up to max_size, handed out
+    most-recently-used first, checked before being handed out, and always
+    returned with no transaction open.
+
+    Pooled connections run in autocommit mode, so a read is one round trip
+    (no BEGIN, and no ROLLBACK when it goes back to the pool). Work that
+    needs several statements to be atomic uses transaction().
+    """
+
+    def __init__(self, connection_params, min_size=1, max_size=10, checkout_timeout=5.0,
+                 validate_after_seconds=30.0):
+        """
+        Args:
+            connection_params (dict): Keyword arguments for psycopg2.connect
+            min_size (int): Connections opened up front by open()
+            max_size (int): Most connections open at once
+            checkout_timeout (float): Seconds to wait for a free connection before PoolTimeout
+            validate_after_seconds (float): Idle connections older than this are pinged
+                                            with SELECT 1 before reuse (0 pings every checkout)
+        """
+        self.connection_params = connection_params
+        self.min_size = min_size
+        self.max_size = max(max_size, min_size, 1)
+        self.checkout_timeout = checkout_timeout
+        self.validate_after_seconds = validate_after_seconds
+
+        self.condition = threading.Condition()
+        self.idle = deque()  # (connection, returned_at) - newest on the right
+        self.size = 0  # connections open (idle + checked out + being opened)
+        self.in_use = 0
+        self.waiting = 0
+        self.closed = False
+        self.stats = {
+            'checkouts': 0,
+            'timeouts': 0,
+            'connections_opened': 0,
+            'connections_discarded': 0,
+            'validation_failures': 0,
+            'peak_in_use': 0,
+            'total_wait_ms': 0.0,
+            'max_wait_ms': 0.0
+        }
+
+    def open(self):
+        """
+        Open min_size connections. Raises psycopg2.Error if the database is unreachable.
+        """
+        with self.condition:
+            self.closed = False
+        while True:
+            with self.condition:
+                if self.size >= self.min_size:
+                    return
+                self.size += 1
+            try:
+                conn = self._connect()
+            except Exception:
+                with self.condition:
+                    self.size -= 1
+                raise
+            with self.condition:
+                self.idle.append((conn, time.monotonic()))
+                self.condition.notify()
+
+    def getconn(self, timeout=None):
+        """
+        Check out a connection, waiting up to `timeout` (default checkout_timeout)
+        for one to be returned if the pool is at max_size.
+
+        Raises:
+            PoolTimeout: No connection became free in time
+            psycopg2.Error: A new connection could not be opened
+        """
+        timeout = self.checkout_timeout if timeout is None else timeout
+        started = time.monotonic()
+        deadline = started + timeout
+
+        while True:
+            conn = None
+            with self.condition:
+                while not self.idle and self.size >= self.max_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0 or self.closed:
+                        self.stats['timeouts'] += 1
+                        raise PoolTimeout(f"No database connection free after {timeout}s "
+                                          f"({self.in_use}/{self.max_size} in use)")
+                    self.waiting += 1
+                    self.condition.wait(remaining)
+                    self.waiting -= 1
+
+                if self.idle:
+                    conn, returned_at = self.idle.pop()
+                else:
+                    self.size += 1
+
+            if conn is None:
+                try:
+                    conn = self._connect()
+                except Exception:
+                    with self.condition:
+                        self.size -= 1
+                        self.condition.notify()
+                    raise
+            elif not self._is_healthy(conn, returned_at):
+                self._discard(conn)
+                continue
+
+            self._checked_out(time.monotonic() - started)
+            return conn
+
+    def putconn(self, conn, discard=False):
+        """
+        Return a connection. Any open transaction is rolled back and autocommit
+        restored; broken or closed connections (or discard=True) are closed
+        instead of reused.
+        """
+        if not discard and not conn.closed:
+            try:
+                if conn.get_transaction_status() != extensions.TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+                if not conn.autocommit:
+                    conn.autocommit = True
+            except Error:
+                discard = True
+
+        with self.condition:
+            self.in_use -= 1
+            if not discard and not conn.closed and not self.closed:
+                self.idle.append((conn, time.monotonic()))
+                self.condition.notify()
+                return
+        self._discard(conn)
+
+    @contextmanager
+    def connection(self, timeout=None):
+        """
+        Check out a connection for a `with` block. The connection is in
+        autocommit mode, so each statement commits on its own; connection-level
+        errors drop the connection from the pool.
+        """
+        conn = self.getconn(timeout)
+        try:
+            yield conn
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            self.putconn(conn, discard=True)
+            raise
+        except Exception:
+            self.putconn(conn)
+            raise
+        else:
+            self.putconn(conn)
+
+    @contextmanager
+    def transaction(self, timeout=None):
+        """
+        Check out a connection for a `with` block that runs as one transaction:
+        committed when the block exits, rolled back on an exception.
+        """
+        with self.connection(timeout) as conn:
+            conn.autocommit = False
+            yield conn  # on an exception putconn rolls back and restores autocommit
+            conn.commit()
+
+    def closeall(self):
+        """Close idle connections; checked-out ones are closed when returned."""
+        with self.condition:
+            self.closed = True
+            idle = list(self.idle)
+            self.idle.clear()
+            self.condition.notify_all()
+        for conn, _ in idle:
+            self._discard(conn)
+
+    def get_stats(self):
+        """
+        Get pool utilization metrics.
+
+        Returns:
+            dict: Sizes, counters, average checkout wait and utilization (in_use / max_size)
+        """
+        with self.condition:
+            stats = dict(self.stats)
+            stats.update({
+                'size': self.size,
+                'idle': len(self.idle),
+                'in_use': self.in_use,
+                'waiting': self.waiting,
+                'min_size': self.min_size,
+                'max_size': self.max_size
+            })
+        checkouts = stats['checkouts']
+        stats['average_wait_ms'] = round(stats.pop('total_wait_ms') / checkouts, 3) if checkouts else 0.0
+        stats['utilization'] = round(stats['in_use'] / stats['max_size'], 3)
+        return stats
+
+    def _connect(self):
+        conn = psycopg2.connect(**self.connection_params)
+        conn.autocommit = True
+        with self.condition:
+            self.stats['connections_opened'] += 1
+        return conn
+
+    def _is_healthy(self, conn, returned_at):
+        if conn.closed or conn.get_transaction_status() == extensions.TRANSACTION_STATUS_UNKNOWN:
+            healthy = False
+        elif time.monotonic() - returned_at < self.validate_after_seconds:
+            return True
+        else:
+            try:
+                with conn.cursor() as cursor:
+                    cursor.execute("SELECT 1")
+                return True
+            except Error:
+                healthy = False
+
+        with self.condition:
+            self.stats['validation_failures'] += 1
+        logger.warning("Discarding broken pooled database connection")
+        return healthy
+
+    def _discard(self, conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+        with self.condition:
+            self.size -= 1
+            self.stats['connections_discarded'] += 1
+            self.condition.notify()
+
+    def _checked_out(self, waited):
+        wait_ms = waited * 1000
+        with self.condition:
+            self.in_use += 1
+            self.stats['checkouts'] += 1
+            self.stats['total_wait_ms'] += wait_ms
+            if wait_ms > self.stats['max_wait_ms']:
+                self.stats['max_wait_ms'] = round(wait_ms, 3)
+            if self.in_use > self.stats['peak_in_use']:
+                self.stats['peak_in_use'] = self.in_use
@@ -0,0 +1,98 @@
+import time
+from collections import deque
+from itertools import islice
+from threading import Condition, Lock
+
+
+class EventLog:
+    """
+    Thread-safe, fixed-capacity ring of game events for the play-by-play.
+    Every event gets a monotonically increasing sequence number ('seq') that
+    clients use as their cursor; sequence numbers keep increasing across
+    clear() so old cursors never match new events.
+    """
+
+    def __init__(self, capacity=100):
+        self.capacity = capacity
+        self.lock = Lock()
+        self.condition = Condition(self.lock)  # notified on every add, for long-polling readers
+        self.events = deque(maxlen=capacity)  # oldest events fall off the left
+        self.last_seq = 0  # seq of the newest event ever added
+        self.listeners = []  # callables notified after every add
+
+    def add_listener(self, callback):
+        """
+        Register a callable to be notified (with no arguments) after each new
+        event. It runs while the lock is held, so it must be quick.
+        """
+        self.listeners.append(callback)
+
+    def add(self, event_type, message, details=None):
+        """
+        Append an event, overwriting the oldest one when full.
+
+        Returns:
+            dict: The stored event
+        """
+        with self.lock:
+            self.last_seq += 1
+            event = {
+                'seq': self.last_seq,
+                'type': event_type,
+                'message': message,
+                'timestamp': time.time(),
+                'details': details or {}
+            }
+            self.events.append(event)
+            self.condition.notify_all()
+            for callback in self.listeners:
+                callback()
+            return event
+
+    def since(self, seq):
+        """
+        Get events newer than a cursor.
+
+        Args:
+            seq: Sequence number of the last event the client has seen
+
+        Returns:
+            tuple: (events, missed, last_seq) where missed is how many events
+            after the cursor are no longer in the ring (overwritten or cleared)
+            and last_seq is the client's next cursor
+        """
+        with self.lock:
+            if seq > self.last_seq:
+                # Cursor from before a server restart: resend what we have
+                return list(self.events), 0, self.last_seq
+
+            first_seq = self.last_seq - len(self.events) + 1
+            start = max(seq + 1, first_seq)
+            missed = start - (seq + 1)
+            # Sequence numbers in the ring are contiguous, so the cursor maps straight to an offset
+            return list(islice(self.events, start - first_seq, None)), missed, self.last_seq
+
+    def wait_for_events(self, seq, timeout):
+        """
+        Block until there is an event after `seq` or the timeout expires.
+
+        Returns:
+            bool: True if new events are available
+        """
+        with self.condition:
+            return self.condition.wait_for(lambda: self.last_seq != seq, timeout)
+
+    def recent(self, count=20):
+        """
+        Get the newest `count` events
+
+        Returns:
+            tuple: (events, last_seq)
+        """
+        with self.lock:
+            return list(self.events)[-count:], self.last_seq
+
+    def clear(self):
+        """Drop all events (sequence numbers keep increasing)."""
+        with self.lock:
+            self.events.clear()
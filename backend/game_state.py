@@ -1,8 +1,62 @@
 import logging
+import uuid
+from bisect import bisect_left, insort
+from collections import namedtuple
 from threading import Lock
+from backend.config import GAME_CONFIG, GAME_CODES
 
 logger = logging.getLogger(__name__)
 
+# Hit classifications returned by GameState.apply_hit
+HIT_ENEMY = 'hit'
+HIT_FRIENDLY = 'friendly_fire'
+HIT_BASE = 'base_hit'
+HIT_OWN_BASE = 'own_base'
+HIT_UNKNOWN = 'unknown'  # attacker and/or victim not registered
+
+# Outcome of one hit: kind is one of the HIT_* constants, points is what was applied
+# to each affected player, broadcasts lists the codes to send (in order)
+HitResult = namedtuple('HitResult', ['kind', 'attacker_id', 'attacker_name', 'victim_id',
+                                     'victim_name', 'points', 'broadcasts'])
+
+
+class PlayerRecord:
+    """
+    Compact per-equipment player record. Slotted so hot-path score updates
+    mutate attributes in place without per-player dict overhead.
+    """
+    
+    __slots__ = ('equipment_id', 'player_id', 'codename', 'team', 'score', 'hit_base')
+    
+    def __init__(self, equipment_id, player_id, codename, team):
+        self.equipment_id = equipment_id
+        self.player_id = player_id
+        self.codename = codename
+        self.team = team
+        self.score = 0
+        self.hit_base = False
+    
+    def as_dict(self):
+        """Player info in the {player_id, codename, team, score, hit_base} form"""
+        return {
+            'player_id': self.player_id,
+            'codename': self.codename,
+            'team': self.team,
+            'score': self.score,
+            'hit_base': self.hit_base
+        }
+    
+    def as_row(self):
+        """Scoreboard row as served by /game/state"""
+        return {
+            'equipment_id': self.equipment_id,
+            'player_id': self.player_id,
+            'codename': self.codename,
+            'score': self.score,
+            'hit_base': self.hit_base
+        }
+
+
 class GameState:
     """
     Manages the game state including player scores, teams, and equipment mappings.
@@ -10,8 +64,20 @@ class GameState:
     
     def __init__(self):
         self.lock = Lock()
-        self.players = {}  # equipment_id -> {player_id, codename, team, score, hit_base}
+        self.players = {}  # equipment_id -> PlayerRecord
         self.is_game_active = False
+        # Running aggregates kept in step with self.players so team reads are O(1)
+        self.team_totals = {}  # team -> sum of player scores
+        self.team_counts = {}  # team -> number of players
+        # Per-team leaderboard: sorted list of (-score, equipment_id), highest score first
+        self.team_index = {}
+        # Monotonic version bumped on every mutation, for delta queries. Versions restart
+        # at 0 with the process, so deltas are only valid within the same epoch.
+        self.epoch = uuid.uuid4().hex[:12]
+        self.version = 0
+        self.changed_at = {}  # equipment_id -> version of that player's last change
+        self.full_since = 0  # deltas from before this version need a full resend (reset/clear)
+        self.listeners = []  # callables notified after every version bump
         
     def add_player(self, equipment_id, player_id, codename, team):
         """
@@ -24,24 +90,42 @@ class GameState:
             team: 'red' or 'green'
         """
         with self.lock:
-            self.players[equipment_id] = {
-                'player_id': player_id,
-                'codename': codename,
-                'team': team,
-                'score': 0,
-                'hit_base': False
-            }
-            logger.info(f"Added player {codename} (ID: {player_id}, Equipment: {equipment_id}) to {team} team")
+            self._register(equipment_id, player_id, codename, team)
+            self._bump(equipment_id)
+    
+    def add_players(self, players):
+        """
+        Add a whole roster in one locked section (one version bump)
+        
+        Args:
+            players: Iterable of (equipment_id, player_id, codename, team) tuples
+        """
+        with self.lock:
+            equipment_ids = []
+            for equipment_id, player_id, codename, team in players:
+                self._register(equipment_id, player_id, codename, team)
+                equipment_ids.append(equipment_id)
+            if equipment_ids:
+                self._bump(*equipment_ids)
+    
+    def add_listener(self, callback):
+        """
+        Register a callable to be notified (with no arguments) whenever the
+        version changes. It runs while the lock is held, so it must be quick
+        and must not call back into GameState.
+        """
+        self.listeners.append(callback)
     
     def get_player(self, equipment_id):
-        """Get player info by equipment ID"""
+        """Get a snapshot of player info by equipment ID (dict, or None if not found)"""
         with self.lock:
-            return self.players.get(equipment_id)
+            player = self.players.get(equipment_id)
+            return player.as_dict() if player else None
     
     def get_all_players(self):
-        """Get all players"""
+        """Get a snapshot of all players as equipment_id -> player info dicts"""
         with self.lock:
-            return dict(self.players)
+            return {equipment_id: player.as_dict() for equipment_id, player in self.players.items()}
     
     def update_score(self, equipment_id, points):
         """
@@ -56,8 +140,8 @@ class GameState:
         """
         with self.lock:
             if equipment_id in self.players:
-                self.players[equipment_id]['score'] += points
-                new_score = self.players[equipment_id]['score']
+                new_score = self._adjust_score(equipment_id, points)
+                self._bump(equipment_id)
                 logger.info(f"Player {equipment_id} score updated by {points} to {new_score}")
                 return new_score
             return None
@@ -66,7 +150,8 @@ class GameState:
         """Mark that a player hit a base"""
         with self.lock:
             if equipment_id in self.players:
-                self.players[equipment_id]['hit_base'] = True
+                self.players[equipment_id].hit_base = True
+                self._bump(equipment_id)
                 logger.info(f"Player {equipment_id} marked as hitting base")
                 return True
             return False
@@ -89,7 +174,59 @@ class GameState:
             if not attacker or not victim:
                 return False
             
-            return attacker['team'] == victim['team']
+            return attacker.team == victim.team
+    
+    def apply_hit(self, transmitting_id, hit_id):
+        """
+        Resolve both players, classify the hit and apply every score/flag
+        change under a single lock acquisition, so the friendly fire check
+        and the score updates see the same state.
+        
+        Args:
+            transmitting_id: Equipment ID of the player who fired
+            hit_id: Equipment ID that was hit, or a base code (53 red, 43 green)
+            
+        Returns:
+            HitResult describing what happened
+        """
+        red_base = GAME_CODES['red_base_scored']
+        green_base = GAME_CODES['green_base_scored']
+        
+        with self.lock:
+            attacker = self.players.get(transmitting_id)
+            attacker_name = attacker.codename if attacker else f"Player {transmitting_id}"
+            
+            if hit_id == red_base or hit_id == green_base:
+                scoring_team = 'green' if hit_id == red_base else 'red'
+                if attacker and attacker.team == scoring_team:
+                    points = GAME_CONFIG['base_score_points']
+                    self._adjust_score(transmitting_id, points)
+                    attacker.hit_base = True
+                    self._bump(transmitting_id)
+                    result = HitResult(HIT_BASE, transmitting_id, attacker_name, hit_id, None, points, (hit_id,))
+                else:
+                    result = HitResult(HIT_OWN_BASE, transmitting_id, attacker_name, hit_id, None, 0, ())
+            else:
+                victim = self.players.get(hit_id)
+                victim_name = victim.codename if victim else f"Player {hit_id}"
+                
+                if attacker and victim and attacker.team == victim.team:
+                    points = GAME_CONFIG['points_penalty']
+                    self._adjust_score(transmitting_id, points)
+                    self._adjust_score(hit_id, points)
+                    self._bump(transmitting_id, hit_id)
+                    result = HitResult(HIT_FRIENDLY, transmitting_id, attacker_name, hit_id, victim_name,
+                                       points, (transmitting_id, hit_id))
+                else:
+                    points = GAME_CONFIG['points_per_hit'] if attacker else 0
+                    if attacker:
+                        self._adjust_score(transmitting_id, points)
+                        self._bump(transmitting_id)
+                    kind = HIT_ENEMY if attacker and victim else HIT_UNKNOWN
+                    result = HitResult(kind, transmitting_id, attacker_name, hit_id, victim_name, points, (hit_id,))
+        
+        logger.debug(f"Hit {transmitting_id}->{hit_id}: {result.kind} ({result.points} points)")
+        return result
     
     def get_team_score(self, team):
         """
@@ -101,37 +238,205 @@ class GameState:
         Returns:
             Total team score
         """
+        return self.team_totals.get(team, 0)
+    
+    def get_team_player_count(self, team):
+        """Get the number of players on a team"""
+        return self.team_counts.get(team, 0)
+    
+    def check_aggregates(self):
+        """
+        Recount team totals, player counts and leaderboards from scratch and
+        compare them with the running aggregates.
+        
+        Returns:
+            True if the aggregates match a full recount, False otherwise
+        """
         with self.lock:
-            total = 0
-            for player in self.players.values():
-                if player['team'] == team:
-                    total += player['score']
-            return total
+            totals = {}
+            counts = {}
+            index = {}
+            for equipment_id, player in self.players.items():
+                totals[player.team] = totals.get(player.team, 0) + player.score
+                counts[player.team] = counts.get(player.team, 0) + 1
+                index.setdefault(player.team, []).append((-player.score, equipment_id))
+            
+            teams = set(totals) | set(self.team_totals)
+            consistent = all(totals.get(t, 0) == self.team_totals.get(t, 0) and
+                             counts.get(t, 0) == self.team_counts.get(t, 0) and
+                             sorted(index.get(t, [])) == self.team_index.get(t, []) for t in teams)
+        
+        if not consistent:
+            logger.error(f"Team aggregates out of sync: totals {self.team_totals} vs {totals}, "
+                         f"counts {self.team_counts} vs {counts}")
+        return consistent
+    
+    def top_n(self, team, n=None):
+        """
+        Get a team's players ordered by score (highest first, ties by equipment ID)
+        
+        Args:
+            team: 'red' or 'green'
+            n: Maximum number of players to return (None for the whole team)
+            
+        Returns:
+            List of {equipment_id, player_id, codename, score, hit_base} dicts
+        """
+        with self.lock:
+            return self._team_rows(team, n)
+    
+    def get_scoreboard(self, n=None):
+        """
+        Get both teams' sorted players and totals from one consistent view
+        
+        Args:
+            n: Maximum number of players per team (None for everyone)
+        """
+        with self.lock:
+            return self._full_scoreboard(n)
+    
+    def get_scoreboard_since(self, since, epoch=None):
+        """
+        Get only what changed after a given version
+        
+        Args:
+            since: Version the caller already has (None for a full scoreboard)
+            epoch: Epoch that version came from; anything but the current
+                   epoch (a version from before a restart) gets a full scoreboard
+            
+        Returns:
+            None if nothing changed since that version. Otherwise a scoreboard
+            dict with 'epoch', 'version' and 'full' keys: when 'full' is False each team's
+            'players' holds only the changed players (totals are always current).
+        """
+        with self.lock:
+            if epoch != self.epoch or since is None or since < self.full_since or since > self.version:
+                return self._full_scoreboard()
+            if since == self.version:
+                return None
+            
+            changed = {'red': [], 'green': []}
+            for equipment_id, version in self.changed_at.items():
+                if version > since:
+                    player = self.players[equipment_id]
+                    if player.team in changed:
+                        changed[player.team].append(player.as_row())
+            return self._scoreboard(changed['red'], changed['green'], full=False)
+    
+    def _full_scoreboard(self, n=None):
+        """Scoreboard with every player. Caller must hold the lock."""
+        return self._scoreboard(self._team_rows('red', n), self._team_rows('green', n), full=True)
+    
+    def _scoreboard(self, red_players, green_players, full):
+        """Assemble the /game/state payload. Caller must hold the lock."""
+        return {
+            'epoch': self.epoch,
+            'version': self.version,
+            'full': full,
+            'is_active': self.is_game_active,
+            'red_team': {
+                'players': red_players,
+                'total_score': self.team_totals.get('red', 0)
+            },
+            'green_team': {
+                'players': green_players,
+                'total_score': self.team_totals.get('green', 0)
+            }
+        }
+    
+    def _team_rows(self, team, n=None):
+        """Build sorted player rows for a team. Caller must hold the lock."""
+        keys = self.team_index.get(team, [])
+        if n is not None:
+            keys = keys[:n]
+        players = self.players
+        return [players[equipment_id].as_row() for _, equipment_id in keys]
+    
+    def _register(self, equipment_id, player_id, codename, team):
+        """Add or replace the player on a piece of equipment. Caller must hold the lock."""
+        previous = self.players.get(equipment_id)
+        # Find the leaderboard slot first: an equipment ID that can't be ordered
+        # against the team's others raises here, before any state has changed
+        index = self.team_index.get(team, [])
+        position = bisect_left(index, (0, equipment_id))
+        if previous:
+            # Re-registering equipment replaces the old player and their score
+            self.team_totals[previous.team] -= previous.score
+            self.team_counts[previous.team] -= 1
+            self._unindex(equipment_id, previous)
+            if previous.team == team:
+                position = bisect_left(index, (0, equipment_id))
+        
+        self.players[equipment_id] = PlayerRecord(equipment_id, player_id, codename, team)
+        self.team_totals.setdefault(team, 0)
+        self.team_counts[team] = self.team_counts.get(team, 0) + 1
+        self.team_index.setdefault(team, index).insert(position, (0, equipment_id))
+        logger.info(f"Added player {codename} (ID: {player_id}, Equipment: {equipment_id}) to {team} team")
+    
+    def _adjust_score(self, equipment_id, points):
+        """
+        Add points to a player, their team total and reposition them in the
+        team leaderboard. Caller must hold the lock.
+        """
+        player = self.players[equipment_id]
+        if points:
+            self._unindex(equipment_id, player)
+            player.score += points
+            insort(self.team_index[player.team], (-player.score, equipment_id))
+            self.team_totals[player.team] += points
+        return player.score
+    
+    def _bump(self, *equipment_ids):
+        """Advance the version and record which players changed. Caller must hold the lock."""
+        self.version += 1
+        for equipment_id in equipment_ids:
+            self.changed_at[equipment_id] = self.version
+        for callback in self.listeners:
+            callback()
+    
+    def _unindex(self, equipment_id, player):
+        """Remove a player's leaderboard entry. Caller must hold the lock."""
+        index = self.team_index[player.team]
+        del index[bisect_left(index, (-player.score, equipment_id))]
     
     def start_game(self):
         """Mark game as active"""
         with self.lock:
             self.is_game_active = True
+            self._bump()
             logger.info("Game started")
     
     def end_game(self):
         """Mark game as inactive"""
         with self.lock:
             self.is_game_active = False
+            self._bump()
             logger.info("Game ended")
     
     def reset_game(self):
         """Reset all game state"""
         with self.lock:
             for player in self.players.values():
-                player['score'] = 0
-                player['hit_base'] = False
+                player.score = 0
+                player.hit_base = False
+            for team in self.team_totals:
+                self.team_totals[team] = 0
+            for index in self.team_index.values():
+                index[:] = sorted((0, equipment_id) for _, equipment_id in index)
             self.is_game_active = False
+            self._bump()
+            self.full_since = self.version
             logger.info("Game state reset")
     
     def clear_all_players(self):
         """Clear all players from game state"""
         with self.lock:
             self.players.clear()
+            self.team_totals.clear()
+            self.team_counts.clear()
+            self.team_index.clear()
+            self.changed_at.clear()
             self.is_game_active = False
+            self._bump()
+            self.full_since = self.version
             logger.info("All players cleared from game state")
@@ -1,12 +1,17 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify
 from flask_cors import CORS
 import logging
 from backend.database import LaserTagDatabase
-from backend.config import DATABASE_CONFIG
-from backend.game_state import GameState
+from backend.config import DATABASE_CONFIG, UDP_CONFIG, GAME_CODES
+from backend.game_state import GameState, HIT_BASE, HIT_OWN_BASE, HIT_FRIENDLY
+from backend.udp_engine import UdpEngine
+from backend.broadcast_scheduler import BroadcastScheduler
+from backend.event_log import EventLog
 import threading
 import socket
+import select
 import time
+import json
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -15,31 +20,67 @@ app = Flask(__name__)
 CORS(app)
 
 db = LaserTagDatabase(**DATABASE_CONFIG)
+MAX_LOOKUP_IDS = 100  # cap on GET /players?ids=
 game_state = GameState()
 
 udp_broadcast_socket = None
 udp_receive_socket = None
+udp_engine = None  # set when UDP_CONFIG['engine'] == 'asyncio'
 current_network_address = "127.0.0.1"
 broadcast_port = 7500
 receive_port = 7501
 
+# UDP ingest counters (written by the receiver thread, read by /udp/stats)
+udp_ingest_stats = {
+    'packets_received': 0,
+    'batches': 0,
+    'last_batch_size': 0,
+    'largest_batch': 0,
+    'receive_buffer_bytes': 0
+}
+
+# Serialized full /game/state body, rebuilt lazily at most once per GameState version.
+# Stored as one (version, body, etag) tuple so readers never see a torn update.
+state_snapshot = (None, b'', '')
+state_snapshot_lock = threading.Lock()
+STATE_ETAG_PREFIX = game_state.epoch  # distinguishes ETags across server restarts
+
 # Event tracking for real-time updates
-game_events = []  # List of recent game events
 MAX_EVENTS = 100  # Keep last 100 events
+game_events = EventLog(capacity=MAX_EVENTS)  # Ring of recent game events with sequence numbers
 
 def add_game_event(event_type, message, details=None):
     """Add a game event to the events queue"""
-    event = {
-        'type': event_type,
-        'message': message,
-        'timestamp': time.time(),
-        'details': details or {}
-    }
-    game_events.append(event)
-    # Keep only recent events
-    if len(game_events) > MAX_EVENTS:
-        game_events.pop(0)
-    return event
+    return game_events.add(event_type, message, details)
+
+# Long-poll limits for /game/events?wait=
+MAX_EVENT_WAIT_SECONDS = 30
+MAX_EVENT_WAITERS = 32
+EVENT_WAITERS_RETRY_AFTER = 2  # seconds a long-poller turned away (all slots busy) should back off
+event_waiters = threading.BoundedSemaphore(MAX_EVENT_WAITERS)
+
+# Wakes /game/stream clients when scores or events change
+STREAM_HEARTBEAT_SECONDS = 15
+# Each open stream holds a server thread for as long as the client stays connected
+MAX_STREAMS = 32
+STREAMS_RETRY_AFTER = 5  # seconds a client turned away (all stream slots busy) should wait before reconnecting
+stream_slots = threading.BoundedSemaphore(MAX_STREAMS)
+live_updates = threading.Condition()
+
+def notify_live_updates():
+    with live_updates:
+        live_updates.notify_all()
+
+game_state.add_listener(notify_live_updates)
+game_events.add_listener(notify_live_updates)
+
+#formats one server-sent event
+def format_sse(event, data, event_id=None):
+    message = ""
+    if event_id is not None:
+        message += f"id: {event_id}\n"
+    message += f"event: {event}\ndata: {json.dumps(data)}\n\n"
+    return message
 
 
 #sets up udp sockets for broadcast and receieve
@@ -54,9 +95,13 @@ def setup_udp_sockets():
         
         udp_receive_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         udp_receive_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        udp_receive_socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, UDP_CONFIG['receive_buffer_bytes'])
         udp_receive_socket.bind(('', receive_port))
-        udp_receive_socket.settimeout(1.0)
-        logger.info(f"UDP receive socket created for port {receive_port}")
+        # Non-blocking so the receiver thread can drain everything pending on each wakeup
+        udp_receive_socket.setblocking(False)
+        udp_ingest_stats['receive_buffer_bytes'] = udp_receive_socket.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF)
+        logger.info(f"UDP receive socket created for port {receive_port} "
+                    f"(SO_RCVBUF {udp_ingest_stats['receive_buffer_bytes']} bytes)")
         
         return True
     except Exception as e:
@@ -68,6 +113,11 @@ def broadcast_equipment_id(equipment_id):
     global udp_broadcast_socket, current_network_address, broadcast_port
     
     try:
+        if udp_engine:
+            if udp_engine.broadcast(str(equipment_id), current_network_address):
+                logger.info(f"Broadcasted equipment ID: {equipment_id}")
+                return True
+            return False
         if udp_broadcast_socket:
             message = str(equipment_id).encode()
             udp_broadcast_socket.sendto(message, (current_network_address, broadcast_port))
@@ -77,24 +127,66 @@ def broadcast_equipment_id(equipment_id):
         logger.error(f"Broadcast failed for {equipment_id}: {e}")
         return False
 
+# Hit processing and HTTP handlers enqueue here instead of sleeping between sends
+broadcast_scheduler = BroadcastScheduler(broadcast_equipment_id)
+
+#reads every datagram currently queued on the socket (up to max_batch)
+def drain_udp_socket(sock, max_batch):
+    batch = []
+    while len(batch) < max_batch:
+        try:
+            data, addr = sock.recvfrom(UDP_CONFIG['max_datagram_bytes'])
+        except (BlockingIOError, InterruptedError):
+            break
+        batch.append(data.decode(errors='replace').strip())
+    return batch
+
+#reads the kernel drop counter for our receive port from /proc/net/udp (Linux only)
+def read_kernel_udp_drops(port):
+    try:
+        with open('/proc/net/udp') as f:
+            next(f)  # header
+            for line in f:
+                fields = line.split()
+                if int(fields[1].split(':')[1], 16) == port:
+                    return int(fields[-1])
+    except (OSError, ValueError, IndexError, StopIteration):
+        pass
+    return None
+
 #receives udp messages from other devices on the network
 def udp_receiver_thread():
     global udp_receive_socket
     
+    max_batch = UDP_CONFIG['max_batch_size']
     while True:
         try:
             if udp_receive_socket:
-                data, addr = udp_receive_socket.recvfrom(1024)
-                received_message = data.decode().strip()
-                logger.info(f"Received UDP message: {received_message} from {addr}")
-                process_received_udp_data(received_message)
+                readable, _, _ = select.select([udp_receive_socket], [], [], 1.0)
+                if not readable:
+                    continue
+                
+                batch = drain_udp_socket(udp_receive_socket, max_batch)
+                if batch:
+                    udp_ingest_stats['packets_received'] += len(batch)
+                    udp_ingest_stats['batches'] += 1
+                    udp_ingest_stats['last_batch_size'] = len(batch)
+                    if len(batch) > udp_ingest_stats['largest_batch']:
+                        udp_ingest_stats['largest_batch'] = len(batch)
+                    process_received_udp_batch(batch)
+            else:
+                time.sleep(1)
                 
-        except socket.timeout:
-            continue
         except Exception as e:
             logger.error(f"UDP receiver error: {e}")
             time.sleep(1)
 
+#processes a batch of received udp messages in arrival order
+def process_received_udp_batch(messages):
+    logger.debug(f"Processing UDP batch of {len(messages)} messages")
+    for message in messages:
+        process_received_udp_data(message)
+
 #processes received udp data
 def process_received_udp_data(message):
     try:
@@ -104,72 +196,39 @@ def process_received_udp_data(message):
             transmitting_id = int(transmitting_id)
             hit_id = int(hit_id)
             
-            logger.info(f"Player {transmitting_id} hit target {hit_id}")
-            
-            # Get player info
-            attacker = game_state.get_player(transmitting_id)
-            attacker_name = attacker['codename'] if attacker else f"Player {transmitting_id}"
+            result = game_state.apply_hit(transmitting_id, hit_id)
+            attacker_name = result.attacker_name
+            victim_name = result.victim_name
             
-            # Check for base scoring
-            if hit_id == 53:
-                # Red base hit
-                if attacker and attacker['team'] == 'green':
-                    logger.info(f"🎯 GREEN team {attacker_name} hit RED base! +100 points")
-                    game_state.update_score(transmitting_id, 100)
-                    game_state.mark_base_hit(transmitting_id)
-                    add_game_event('base_hit', f"{attacker_name} hit RED BASE! (+100 points)", 
-                                 {'attacker_id': transmitting_id, 'attacker': attacker_name, 'points': 100})
-                    broadcast_equipment_id(hit_id)
-                else:
-                    logger.warning(f"RED team {attacker_name} hit own base - no points")
-                    add_game_event('own_base', f"{attacker_name} hit own base (no points)",
-                                 {'attacker_id': transmitting_id, 'attacker': attacker_name})
-                    
-            elif hit_id == 43:
-                # Green base hit
-                if attacker and attacker['team'] == 'red':
-                    logger.info(f"🎯 RED team {attacker_name} hit GREEN base! +100 points")
-                    game_state.update_score(transmitting_id, 100)
-                    game_state.mark_base_hit(transmitting_id)
-                    add_game_event('base_hit', f"{attacker_name} hit GREEN BASE! (+100 points)",
-                                 {'attacker_id': transmitting_id, 'attacker': attacker_name, 'points': 100})
-                    broadcast_equipment_id(hit_id)
+            if result.kind == HIT_BASE or result.kind == HIT_OWN_BASE:
+                base_team = 'RED' if hit_id == GAME_CODES['red_base_scored'] else 'GREEN'
+                if result.kind == HIT_BASE:
+                    logger.info(f"🎯 {attacker_name} hit {base_team} base! +{result.points} points")
+                    add_game_event('base_hit', f"{attacker_name} hit {base_team} BASE! (+{result.points} points)",
+                                 {'attacker_id': transmitting_id, 'attacker': attacker_name, 'points': result.points})
                 else:
-                    logger.warning(f"GREEN team {attacker_name} hit own base - no points")
+                    logger.warning(f"{base_team} team {attacker_name} hit own base - no points")
                     add_game_event('own_base', f"{attacker_name} hit own base (no points)",
                                  {'attacker_id': transmitting_id, 'attacker': attacker_name})
                     
-            else:
-                # Regular player hit
-                victim = game_state.get_player(hit_id)
-                victim_name = victim['codename'] if victim else f"Player {hit_id}"
+            elif result.kind == HIT_FRIENDLY:
+                logger.warning(f"⚠️  FRIENDLY FIRE! {attacker_name} hit teammate {victim_name}")
+                add_game_event('friendly_fire', f"🚨 FRIENDLY FIRE! {attacker_name} hit {victim_name} ({result.points} points each)",
+                             {'attacker_id': transmitting_id, 'attacker': attacker_name,
+                              'victim_id': hit_id, 'victim': victim_name, 'points': result.points})
                 
-                # Check for friendly fire
-                if game_state.is_friendly_fire(transmitting_id, hit_id):
-                    logger.warning(f"⚠️  FRIENDLY FIRE! {attacker_name} hit teammate {victim_name}")
-                    
-                    # Broadcast both equipment IDs
-                    broadcast_equipment_id(transmitting_id)
-                    time.sleep(0.05)
-                    broadcast_equipment_id(hit_id)
-                    
-                    # Apply -10 points to both players
-                    game_state.update_score(transmitting_id, -10)
-                    game_state.update_score(hit_id, -10)
-                    
-                    add_game_event('friendly_fire', f"🚨 FRIENDLY FIRE! {attacker_name} hit {victim_name} (-10 points each)",
-                                 {'attacker_id': transmitting_id, 'attacker': attacker_name,
-                                  'victim_id': hit_id, 'victim': victim_name, 'points': -10})
-                    
-                else:
-                    # Normal hit: +10 points to attacker
-                    logger.info(f"✓ {attacker_name} hit enemy {victim_name} (+10 points)")
-                    broadcast_equipment_id(hit_id)
-                    game_state.update_score(transmitting_id, 10)
-                    
-                    add_game_event('hit', f"{attacker_name} hit {victim_name} (+10 points)",
-                                 {'attacker_id': transmitting_id, 'attacker': attacker_name,
-                                  'victim_id': hit_id, 'victim': victim_name, 'points': 10})
+            else:
+                # Enemy hit (or a hit involving unregistered equipment)
+                logger.info(f"✓ {attacker_name} hit {victim_name} (+{result.points} points)")
+                add_game_event('hit', f"{attacker_name} hit {victim_name} (+{result.points} points)",
+                             {'attacker_id': transmitting_id, 'attacker': attacker_name,
+                              'victim_id': hit_id, 'victim': victim_name, 'points': result.points})
+            
+            # Friendly fire broadcasts attacker first, then victim shortly after
+            if len(result.broadcasts) > 1:
+                broadcast_scheduler.send_sequence(result.broadcasts, UDP_CONFIG['friendly_fire_spacing_seconds'])
+            elif result.broadcasts:
+                broadcast_scheduler.send(result.broadcasts[0])
             
         elif message.isdigit():
             equipment_id = int(message)
@@ -184,10 +243,31 @@ def process_received_udp_data(message):
     except Exception as e:
         logger.error(f"Failed to process UDP data '{message}': {e}")
 
-#gets all players from the database
+#gets all players from the database, or only the ones in ?ids=1,2,3
 @app.route('/players', methods=['GET'])
 def get_all_players():
     try:
+        ids_param = request.args.get('ids')
+        if ids_param is not None:
+            try:
+                player_ids = [int(part) for part in ids_param.split(',') if part.strip()]
+            except ValueError:
+                return jsonify({'error': 'ids must be a comma-separated list of integers'}), 400
+            if len(player_ids) > MAX_LOOKUP_IDS:
+                return jsonify({'error': f'At most {MAX_LOOKUP_IDS} ids per request'}), 400
+            
+            players = db.get_players_by_ids(player_ids)
+            if players is None:
+                return jsonify({'error': 'Database connection failed'}), 500
+            
+            players_list = [{'id': pid, 'codename': codename} for pid, codename in players]
+            found = {pid for pid, _ in players}
+            return jsonify({
+                'players': players_list,
+                'count': len(players_list),
+                'missing': sorted(set(player_ids) - found)
+            }), 200
+        
         if not db.test_connection():
             return jsonify({'error': 'Database connection failed'}), 500
             
@@ -203,6 +283,25 @@ def get_all_players():
         logger.error(f"Error getting all players: {e}")
         return jsonify({'error': 'Internal server error'}), 500
 
+#returns the cached serialized scoreboard, rebuilding it if the game state changed
+def get_state_snapshot():
+    global state_snapshot
+    
+    snapshot = state_snapshot
+    if snapshot[0] == game_state.version:
+        return snapshot
+    
+    with state_snapshot_lock:
+        # Another poller may have rebuilt it while we waited
+        snapshot = state_snapshot
+        if snapshot[0] == game_state.version:
+            return snapshot
+        
+        board = game_state.get_scoreboard()
+        body = json.dumps(board).encode()
+        state_snapshot = (board['version'], body, f"{STATE_ETAG_PREFIX}-{board['version']}")
+        return state_snapshot
+
 #adds a player to the database
 @app.route('/players', methods=['POST'])
 def add_player():
@@ -223,18 +322,18 @@ def add_player():
         if not isinstance(player_id, int):
             return jsonify({'error': 'Player ID must be an integer'}), 400
         
-        existing_codename = db.get_player_by_id(player_id)
+        if equipment_id is not None and not isinstance(equipment_id, int):
+            return jsonify({'error': 'Equipment ID must be an integer'}), 400
         
-        if existing_codename and not codename:
-            codename = existing_codename
-            
-        if not codename:
-            return jsonify({'error': 'Codename is required for new players'}), 400
-            
-        # Add to database if new
-        if not existing_codename:
-            if not db.add_player(player_id, codename):
+        if codename:
+            # One round trip: inserts a new player, or returns the codename already stored for the ID
+            codename = db.upsert_player(player_id, codename, rename=False)
+            if not codename:
                 return jsonify({'error': 'Failed to add player to database'}), 500
+        else:
+            codename = db.get_player_by_id(player_id)
+            if not codename:
+                return jsonify({'error': 'Codename is required for new players'}), 400
         
         # Add to game state with equipment ID and team
         if equipment_id:
@@ -253,6 +352,87 @@ def add_player():
         logger.error(f"Error adding player: {e}")
         return jsonify({'error': 'Internal server error'}), 500
 
+#adds a whole team roster: one database transaction, one game state update, one paced broadcast burst
+@app.route('/players/batch', methods=['POST'])
+def add_players_batch():
+    try:
+        data = request.get_json()
+        
+        if not data:
+            return jsonify({'error': 'No JSON data provided'}), 400
+        
+        players = data.get('players')
+        if not isinstance(players, list) or not players:
+            return jsonify({'error': 'A non-empty players list is required'}), 400
+        
+        default_team = data.get('team', 'red')
+        results = []  # one entry per submitted row, in order
+        valid = []  # (result, codename) for rows that passed validation
+        seen_ids = set()
+        
+        for row in players:
+            if not isinstance(row, dict):
+                results.append({'status': 'error', 'error': 'Invalid player entry'})
+                continue
+            
+            result = {
+                'id': row.get('id'),
+                'codename': None,
+                'equipment_id': row.get('equipment_id'),
+                'team': str(row.get('team', default_team)).lower()
+            }
+            results.append(result)
+            codename = row.get('codename') or ''
+            
+            if not isinstance(result['id'], int):
+                result.update(status='error', error='Player ID must be an integer')
+            elif result['id'] in seen_ids:
+                result.update(status='error', error='Duplicate player ID in batch')
+            elif result['equipment_id'] is not None and not isinstance(result['equipment_id'], int):
+                result.update(status='error', error='Equipment ID must be an integer')
+            elif not isinstance(codename, str):
+                result.update(status='error', error='Codename must be a string')
+            elif len(codename.strip()) > 30:
+                result.update(status='error', error='Codename too long')
+            elif result['team'] not in ('red', 'green'):
+                result.update(status='error', error='Team must be red or green')
+            else:
+                valid.append((result, codename.strip()))
+            if isinstance(result['id'], int):
+                seen_ids.add(result['id'])
+        
+        if valid:
+            stored = db.upsert_players([(result['id'], codename) for result, codename in valid], rename=False)
+            if stored is None:
+                return jsonify({'error': 'Failed to add players to database'}), 500
+            
+            registered = []
+            for result, _ in valid:
+                if result['id'] not in stored:
+                    result.update(status='error', error='Codename is required for new players')
+                    continue
+                result['codename'], inserted = stored[result['id']]
+                result['status'] = 'added' if inserted else 'existing'
+                if result['equipment_id']:
+                    registered.append(result)
+            
+            # Add to game state under one lock, then broadcast the equipment IDs as one paced burst
+            game_state.add_players([(r['equipment_id'], r['id'], r['codename'], r['team']) for r in registered])
+            broadcast_scheduler.send_sequence([r['equipment_id'] for r in registered],
+                                              UDP_CONFIG['roster_broadcast_spacing_seconds'])
+        
+        failed = sum(1 for result in results if result['status'] == 'error')
+        return jsonify({
+            'players': results,
+            'added': sum(1 for result in results if result['status'] == 'added'),
+            'existing': sum(1 for result in results if result['status'] == 'existing'),
+            'failed': failed
+        }), 201 if not failed else 207
+            
+    except Exception as e:
+        logger.error(f"Error adding players: {e}")
+        return jsonify({'error': 'Internal server error'}), 500
+
 #gets a player from the database
 @app.route('/players/<int:player_id>', methods=['GET'])
 def get_player(player_id):
@@ -353,14 +533,21 @@ def start_game():
 def end_game():
     try:
         game_state.end_game()
-        # Broadcast code 221 three times as required
-        for i in range(3):
-            if not broadcast_equipment_id(221):
-                return jsonify({'error': f'Failed to broadcast game end (attempt {i+1})'}), 500
-            time.sleep(0.1)  # delay between broadcasts
+        # Broadcast code 221 three times as required: the first one now, so a dead socket
+        # is reported to the caller, the rest paced by the scheduler
+        repeats = UDP_CONFIG['game_end_repeats']
+        interval = UDP_CONFIG['game_end_interval_seconds']
+        if not broadcast_equipment_id(221):
+            return jsonify({'error': 'Failed to broadcast game end',
+                            'broadcast_queue': broadcast_scheduler.get_stats()}), 500
+        for i in range(1, repeats):
+            broadcast_scheduler.send(221, delay=i * interval)
             
         add_game_event('game_end', 'Game ended!')
-        return jsonify({'message': 'Game ended - code 221 broadcasted 3 times'}), 200
+        return jsonify({
+            'message': f'Game ended - code 221 broadcasted once, {repeats - 1} more queued',
+            'broadcast_queue': broadcast_scheduler.get_stats()
+        }), 200
     except Exception as e:
         logger.error(f"Error ending game: {e}")
         return jsonify({'error': 'Internal server error'}), 500
@@ -369,41 +556,31 @@ def end_game():
 @app.route('/game/state', methods=['GET'])
 def get_game_state():
     try:
-        all_players = game_state.get_all_players()
-        
-        # Organize by team
-        red_team = []
-        green_team = []
-        
-        for equipment_id, player_info in all_players.items():
-            player_data = {
-                'equipment_id': equipment_id,
-                'player_id': player_info['player_id'],
-                'codename': player_info['codename'],
-                'score': player_info['score'],
-                'hit_base': player_info['hit_base']
-            }
-            
-            if player_info['team'] == 'red':
-                red_team.append(player_data)
-            else:
-                green_team.append(player_data)
+        # Optional: only players changed after this version (304 if nothing changed).
+        # The version is only meaningful with the epoch it came from; a missing or
+        # stale epoch (server restarted) gets a full scoreboard.
+        since = request.args.get('since', type=int)
+        if since is not None:
+            delta = game_state.get_scoreboard_since(since, request.args.get('epoch'))
+            if delta is None:
+                return '', 304
+            return jsonify(delta), 200
         
-        # Sort by score (highest first)
-        red_team.sort(key=lambda x: x['score'], reverse=True)
-        green_team.sort(key=lambda x: x['score'], reverse=True)
+        # Optional: only the top N players per team (big-screen displays)
+        top = request.args.get('top', type=int)
+        if top is not None or 'top' in request.args:
+            if top is None or top < 1:
+                return jsonify({'error': 'top must be a positive integer'}), 400
+            return jsonify(game_state.get_scoreboard(top)), 200
         
-        return jsonify({
-            'is_active': game_state.is_game_active,
-            'red_team': {
-                'players': red_team,
-                'total_score': game_state.get_team_score('red')
-            },
-            'green_team': {
-                'players': green_team,
-                'total_score': game_state.get_team_score('green')
-            }
-        }), 200
+        # Full scoreboard: shared cached body, 304 if the client's ETag is current
+        version, body, etag = get_state_snapshot()
+        if etag in request.if_none_match:
+            response = Response(status=304)
+        else:
+            response = Response(body, status=200, mimetype='application/json')
+        response.set_etag(etag)
+        return response
         
     except Exception as e:
         logger.error(f"Error getting game state: {e}")
@@ -413,20 +590,123 @@ def get_game_state():
 @app.route('/game/events', methods=['GET'])
 def get_game_events():
     try:
-        # Optional: filter by timestamp
-        since = request.args.get('since', type=float)
+        # Optional: only events after this sequence number
+        since = request.args.get('since', type=int)
+        # Optional: long-poll up to this many seconds for events after `since`
+        wait = request.args.get('wait', type=float)
+        
+        # Only wait if there is nothing new yet
+        if since is not None and wait and wait > 0 and since == game_events.last_seq:
+            # Too many clients already waiting: tell this one to back off instead of
+            # tying up another thread (or answering empty and inviting a tight re-poll)
+            if not event_waiters.acquire(blocking=False):
+                response = jsonify({'error': 'Too many clients waiting for events',
+                                    'retry_after': EVENT_WAITERS_RETRY_AFTER})
+                response.headers['Retry-After'] = str(EVENT_WAITERS_RETRY_AFTER)
+                return response, 503
+            try:
+                game_events.wait_for_events(since, min(wait, MAX_EVENT_WAIT_SECONDS))
+            finally:
+                event_waiters.release()
         
-        if since:
-            filtered_events = [e for e in game_events if e['timestamp'] > since]
-            return jsonify({'events': filtered_events}), 200
+        if since is not None:
+            events, missed, last_seq = game_events.since(since)
+            return jsonify({'events': events, 'missed': missed, 'last_seq': last_seq}), 200
         else:
             # Return last 20 events
-            return jsonify({'events': game_events[-20:]}), 200
+            events, last_seq = game_events.recent(20)
+            return jsonify({'events': events, 'missed': 0, 'last_seq': last_seq}), 200
             
     except Exception as e:
         logger.error(f"Error getting events: {e}")
         return jsonify({'error': 'Internal server error'}), 500
 
+#score changes and new events in one response (for displays that poll)
+@app.route('/game/snapshot', methods=['GET'])
+def get_game_snapshot():
+    try:
+        state_since = request.args.get('state_since', type=int)
+        state_epoch = request.args.get('state_epoch')
+        events_since = request.args.get('events_since', type=int)
+        
+        # Events are read before state: hits update scores before their event is
+        # logged, so every returned event is already reflected in the returned scores
+        if events_since is None:
+            events, last_seq = game_events.recent(20)
+            missed = 0
+        else:
+            events, missed, last_seq = game_events.since(events_since)
+        state = game_state.get_scoreboard_since(state_since, state_epoch)
+        
+        return jsonify({
+            'state': state,  # None if unchanged since state_since
+            'events': {'events': events, 'missed': missed, 'last_seq': last_seq}
+        }), 200
+        
+    except Exception as e:
+        logger.error(f"Error getting game snapshot: {e}")
+        return jsonify({'error': 'Internal server error'}), 500
+
+#pushes score deltas and new events as they happen (server-sent events)
+@app.route('/game/stream', methods=['GET'])
+def stream_game_updates():
+    # Resume points: state version (and its epoch) and event sequence the client already has
+    state_since = request.args.get('state_since', type=int)
+    state_epoch_since = request.args.get('state_epoch')
+    events_since = request.args.get('since', type=int)
+    if events_since is None:
+        events_since = request.headers.get('Last-Event-ID', type=int)
+    
+    if not stream_slots.acquire(blocking=False):
+        response = jsonify({'error': 'Too many open game streams', 'retry_after': STREAMS_RETRY_AFTER})
+        response.headers['Retry-After'] = str(STREAMS_RETRY_AFTER)
+        return response, 503
+    released = []
+    
+    def release_slot():
+        if not released:
+            released.append(True)
+            stream_slots.release()
+    
+    def generate():
+        state_version = state_since
+        state_epoch = state_epoch_since
+        event_seq = events_since
+        try:
+            yield "retry: 2000\n\n"
+                
+            while True:
+                board = game_state.get_scoreboard_since(state_version, state_epoch)
+                if board is not None:
+                    state_version = board['version']
+                    state_epoch = board['epoch']
+                    yield format_sse('state', board)
+                
+                if event_seq is None:
+                    events, last_seq = game_events.recent(20)
+                    missed = 0
+                else:
+                    events, missed, last_seq = game_events.since(event_seq)
+                if events or missed or last_seq != event_seq:
+                    event_seq = last_seq
+                    yield format_sse('events', {'events': events, 'missed': missed, 'last_seq': last_seq}, event_id=last_seq)
+                
+                # Sleep until something changes; never yield while holding the condition
+                with live_updates:
+                    idle = game_state.version == state_version and game_events.last_seq == event_seq
+                    if idle:
+                        idle = not live_updates.wait(STREAM_HEARTBEAT_SECONDS)
+                if idle:
+                    yield ": heartbeat\n\n"
+        finally:
+            release_slot()
+    
+    response = Response(generate(), mimetype='text/event-stream',
+                        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+    # Covers a stream closed before generate() ever ran (its finally never would)
+    response.call_on_close(release_slot)
+    return response
+
 #reset game state
 @app.route('/game/reset', methods=['POST'])
 def reset_game():
@@ -439,6 +719,19 @@ def reset_game():
         logger.error(f"Error resetting game: {e}")
         return jsonify({'error': 'Internal server error'}), 500
 
+#udp ingest counters
+@app.route('/udp/stats', methods=['GET'])
+def get_udp_stats():
+    stats = dict(udp_engine.stats) if udp_engine else dict(udp_ingest_stats)
+    stats['engine'] = 'asyncio' if udp_engine else 'thread'
+    stats['kernel_drops'] = read_kernel_udp_drops(receive_port)
+    if stats.get('batches'):
+        stats['average_batch_size'] = round(stats['packets_received'] / stats['batches'], 2)
+    elif 'batches' in stats:
+        stats['average_batch_size'] = 0
+    stats['broadcast_queue'] = broadcast_scheduler.get_stats()
+    return jsonify(stats), 200
+
 #health checks
 @app.route('/health', methods=['GET'])
 def health_check():
@@ -446,11 +739,15 @@ def health_check():
     return jsonify({
         'status': 'healthy' if db_status else 'unhealthy',
         'database': 'connected' if db_status else 'disconnected',
-        'udp_sockets': 'active' if udp_broadcast_socket and udp_receive_socket else 'inactive'
+        'database_pool': db.get_pool_stats(),
+        'codename_cache': db.get_cache_stats(),
+        'udp_sockets': 'active' if (udp_broadcast_socket and udp_receive_socket) or (udp_engine and udp_engine.is_running) else 'inactive'
     }), 200 if db_status else 503
 
 #runs server
 def start_server():
+    global udp_engine
+    
     # Verify database connectivity directly; avoid executing external scripts which
     # may require sudo or prompt for passwords when running the server.
     logger.info("Verifying database connectivity...")
@@ -459,13 +756,23 @@ def start_server():
         logger.error("Failed to connect to database.")
         return False
     
-    if not setup_udp_sockets():
-        logger.error("Failed to set up UDP sockets.")
-        return False
+    if UDP_CONFIG['engine'] == 'asyncio':
+        udp_engine = UdpEngine(process_received_udp_data, receive_port, broadcast_port,
+                               receive_buffer_bytes=UDP_CONFIG['receive_buffer_bytes'])
+        if not udp_engine.start():
+            logger.error("Failed to start asyncio UDP engine.")
+            return False
+        logger.info("asyncio UDP engine started")
+    else:
+        if not setup_udp_sockets():
+            logger.error("Failed to set up UDP sockets.")
+            return False
+        
+        udp_thread = threading.Thread(target=udp_receiver_thread, daemon=True)
+        udp_thread.start()
+        logger.info("UDP receiver thread started")
     
-    udp_thread = threading.Thread(target=udp_receiver_thread, daemon=True)
-    udp_thread.start()
-    logger.info("UDP receiver thread started")
+    broadcast_scheduler.start()
     
     logger.info("Starting Laser Tag API server...")
     app.run(host='0.0.0.0', port=5000, debug=True)
@@ -0,0 +1,165 @@
+import asyncio
+import logging
+import socket
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class _ReceiveProtocol(asyncio.DatagramProtocol):
+    """Hands every datagram arriving on the receive port to the engine."""
+
+    def __init__(self, engine):
+        self.engine = engine
+
+    def datagram_received(self, data, addr):
+        self.engine._on_datagram(data, addr)
+
+    def error_received(self, exc):
+        logger.error(f"UDP receive error: {exc}")
+
+
+class _BroadcastProtocol(asyncio.DatagramProtocol):
+    """Outbound-only endpoint; only reports send errors."""
+
+    def error_received(self, exc):
+        logger.error(f"UDP broadcast error: {exc}")
+
+
+class UdpEngine:
+    """
+    asyncio-based alternative to the UDP receiver thread.
+    Owns both the receive endpoint (hits) and the broadcast endpoint
+    (equipment IDs and game codes) on a single event loop running in its
+    own daemon thread, so the Flask server keeps the main thread.
+    """
+
+    def __init__(self, handler, receive_port, broadcast_port, receive_buffer_bytes=None):
+        """
+        Args:
+            handler: Called on the event loop with each decoded message
+                     (normally process_received_udp_data)
+            receive_port: Port hits arrive on (7501)
+            broadcast_port: Port broadcasts are sent to (7500)
+            receive_buffer_bytes: Optional SO_RCVBUF size for the receive socket
+        """
+        self.handler = handler
+        self.receive_port = receive_port
+        self.broadcast_port = broadcast_port
+        self.receive_buffer_bytes = receive_buffer_bytes
+
+        self.loop = None
+        self.thread = None
+        self.receive_transport = None
+        self.broadcast_transport = None
+        self.is_running = False
+
+        self.stats = {
+            'packets_received': 0,
+            'broadcasts_sent': 0,
+            'broadcast_errors': 0,
+            'receive_buffer_bytes': 0
+        }
+
+    def start(self, timeout=5.0) -> bool:
+        """
+        Start the event loop thread and open both endpoints.
+
+        Returns:
+            bool: True once both endpoints are open, False otherwise
+        """
+        ready = threading.Event()
+        self.thread = threading.Thread(target=self._run, args=(ready,), daemon=True, name="udp-engine")
+        self.thread.start()
+        ready.wait(timeout)
+        return self.is_running
+
+    def stop(self):
+        """Stop the event loop; endpoints are closed by the loop thread."""
+        if self.loop and self.is_running:
+            self.loop.call_soon_threadsafe(self.loop.stop)
+
+    def broadcast(self, message, address) -> bool:
+        """
+        Queue a broadcast without blocking the caller.
+        Safe to call from the event loop (hit processing) or any other thread.
+
+        Args:
+            message: str or bytes payload
+            address: Destination host (the current network address)
+
+        Returns:
+            bool: True if the send was queued, False if the engine is not running
+        """
+        if not self.is_running:
+            return False
+
+        payload = message if isinstance(message, bytes) else str(message).encode()
+        if self._on_loop_thread():
+            self._send(payload, address)
+        else:
+            self.loop.call_soon_threadsafe(self._send, payload, address)
+        return True
+
+    def _on_loop_thread(self):
+        return threading.current_thread() is self.thread
+
+    def _send(self, payload, address):
+        try:
+            self.broadcast_transport.sendto(payload, (address, self.broadcast_port))
+            self.stats['broadcasts_sent'] += 1
+        except Exception as e:
+            self.stats['broadcast_errors'] += 1
+            logger.error(f"Broadcast failed for {payload!r}: {e}")
+
+    def _on_datagram(self, data, addr):
+        self.stats['packets_received'] += 1
+        message = data.decode(errors='replace').strip()
+        try:
+            self.handler(message)
+        except Exception as e:
+            logger.error(f"Failed to process UDP data '{message}': {e}")
+
+    async def _open_endpoints(self):
+        receive_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        receive_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        if self.receive_buffer_bytes:
+            receive_socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, self.receive_buffer_bytes)
+        receive_socket.bind(('', self.receive_port))
+        receive_socket.setblocking(False)
+        self.stats['receive_buffer_bytes'] = receive_socket.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF)
+
+        broadcast_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        broadcast_socket.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+        broadcast_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        broadcast_socket.setblocking(False)
+
+        self.receive_transport, _ = await self.loop.create_datagram_endpoint(
+            lambda: _ReceiveProtocol(self), sock=receive_socket)
+        self.broadcast_transport, _ = await self.loop.create_datagram_endpoint(
+            _BroadcastProtocol, sock=broadcast_socket)
+
+    def _run(self, ready):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        try:
+            self.loop.run_until_complete(self._open_endpoints())
+        except Exception as e:
+            logger.error(f"UDP engine setup failed: {e}")
+            ready.set()
+            self.loop.close()
+            return
+
+        self.is_running = True
+        logger.info(f"UDP engine listening on port {self.receive_port}, broadcasting to port {self.broadcast_port}")
+        ready.set()
+        try:
+            self.loop.run_forever()
+        finally:
+            self.is_running = False
+            for transport in (self.receive_transport, self.broadcast_transport):
+                if transport:
+                    transport.close()
+            self.loop.run_until_complete(asyncio.sleep(0))
+            self.loop.close()
+            logger.info("UDP engine stopped")
@@ -1 +1,2 @@
-from .client import ApiClient, team_id_generator, equipment_id_generator, transform_players_for_ui
+from .client import ApiClient, GameStreamSubscriber, get_shared_client, team_id_generator, equipment_id_generator, transform_players_for_ui
+from .network_worker import NetworkWorker
@@ -1,27 +1,77 @@
 import requests
+from requests.adapters import HTTPAdapter
 import json
 import logging
-from typing import Dict, List, Any, Optional
+import threading
+from typing import Callable, Dict, List, Any, Optional
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Connection pool tuning for the shared keep-alive session
+POOL_CONNECTIONS = 4  # distinct hosts kept in the pool manager
+POOL_MAXSIZE = 16  # keep-alive connections per host (stream + worker + entry screen threads)
+DEFAULT_TIMEOUT = (3.05, 5)  # (connect, read) seconds for every call
+
+_shared_clients = {}
+_shared_clients_lock = threading.Lock()
+
+
+def get_shared_client(base_url="http://localhost:5000") -> "ApiClient":
+    """
+    Get the process-wide ApiClient for a backend URL.
+    Every frontend module uses this so HTTP calls share one pooled keep-alive session.
+    """
+    with _shared_clients_lock:
+        client = _shared_clients.get(base_url)
+        if client is None:
+            client = ApiClient(base_url)
+            _shared_clients[base_url] = client
+        return client
+
+
 class ApiClient:
     """
     Client for communicating with the backend API.
     Handles all HTTP requests to the backend server.
     """
     
-    def __init__(self, base_url="http://localhost:5000"):
+    def __init__(self, base_url="http://localhost:5000", timeout=DEFAULT_TIMEOUT):
         """
         Initialize the API client with the base URL of the backend server.
         
         Args:
             base_url (str): Base URL of the backend server
+            timeout: Per-call (connect, read) timeout in seconds
         """
         self.base_url = base_url
+        self.timeout = timeout
         self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+    
+    def connection_stats(self) -> Dict:
+        """
+        Get keep-alive connection counters for this client's session.
+        
+        Returns:
+            dict: {"requests": n, "new_connections": n, "reused_connections": n}
+        """
+        requests_made = 0
+        connections = 0
+        for adapter in set(self.session.adapters.values()):
+            for key in list(adapter.poolmanager.pools.keys()):
+                pool = adapter.poolmanager.pools.get(key)
+                if pool is not None:
+                    requests_made += pool.num_requests
+                    connections += pool.num_connections
+        return {
+            "requests": requests_made,
+            "new_connections": connections,
+            "reused_connections": max(requests_made - connections, 0)
+        }
     
     def _handle_response(self, response):
         """
@@ -69,12 +119,33 @@ class ApiClient:
             }
         """
         try:
-            response = self.session.get(f"{self.base_url}/players")
+            response = self.session.get(f"{self.base_url}/players", timeout=self.timeout)
             return self._handle_response(response)
         except Exception as e:
             logger.error(f"Failed to get players: {e}")
             return {"error": str(e), "players": [], "count": 0}
     
+    def get_players_by_ids(self, player_ids: List[int]) -> Dict:
+        """
+        Look up many players in one request.
+        
+        Args:
+            player_ids (list): Player IDs to resolve
+            
+        Returns:
+            dict: "players" (id/codename for each ID found), "count" and "missing" (IDs not in the database)
+        """
+        try:
+            response = self.session.get(
+                f"{self.base_url}/players",
+                params={"ids": ",".join(str(player_id) for player_id in player_ids)},
+                timeout=self.timeout
+            )
+            return self._handle_response(response)
+        except Exception as e:
+            logger.error(f"Failed to look up players {player_ids}: {e}")
+            return {"error": str(e), "players": [], "count": 0, "missing": []}
+    
     def add_player(self, player_id: int, codename: str, equipment_id: Optional[int] = None, team: str = "red") -> Dict:
         """
         Add a new player to the backend.
@@ -100,13 +171,42 @@ class ApiClient:
         try:
             response = self.session.post(
                 f"{self.base_url}/players", 
-                json=data
+                json=data,
+                timeout=self.timeout
             )
             return self._handle_response(response)
         except Exception as e:
             logger.error(f"Failed to add player: {e}")
             return {"error": str(e)}
     
+    def add_players_batch(self, players: List[Dict], team: Optional[str] = None) -> Dict:
+        """
+        Register a whole roster in one request.
+        
+        Args:
+            players (list): Dicts with "id", and optionally "codename", "equipment_id" and "team"
+            team (str, optional): Team for rows that don't set their own - "red" or "green"
+            
+        Returns:
+            dict: "players" with a per-row "status" ("added", "existing" or "error"),
+                  plus "added", "existing" and "failed" counts
+        """
+        data = {"players": players}
+        if team is not None:
+            data["team"] = team.lower()
+            
+        try:
+            response = self.session.post(
+                f"{self.base_url}/players/batch",
+                json=data,
+                timeout=self.timeout
+            )
+            # 207 means some rows failed; the per-row statuses say which
+            return self._handle_response(response)
+        except Exception as e:
+            logger.error(f"Failed to add players: {e}")
+            return {"error": str(e)}
+    
     def get_player(self, player_id: int) -> Dict:
         """
         Get a player by ID from the backend.
@@ -118,7 +218,7 @@ class ApiClient:
             dict: Player data
         """
         try:
-            response = self.session.get(f"{self.base_url}/players/{player_id}")
+            response = self.session.get(f"{self.base_url}/players/{player_id}", timeout=self.timeout)
             return self._handle_response(response)
         except Exception as e:
             logger.error(f"Failed to get player {player_id}: {e}")
@@ -132,7 +232,7 @@ class ApiClient:
             dict: Response message
         """
         try:
-            response = self.session.delete(f"{self.base_url}/players")
+            response = self.session.delete(f"{self.base_url}/players", timeout=self.timeout)
             return self._handle_response(response)
         except Exception as e:
             logger.error(f"Failed to clear players: {e}")
@@ -148,7 +248,7 @@ class ApiClient:
             dict: Network settings data
         """
         try:
-            response = self.session.get(f"{self.base_url}/network")
+            response = self.session.get(f"{self.base_url}/network", timeout=self.timeout)
             return self._handle_response(response)
         except Exception as e:
             logger.error(f"Failed to get network settings: {e}")
@@ -167,7 +267,8 @@ class ApiClient:
         try:
             response = self.session.post(
                 f"{self.base_url}/network", 
-                json={"address": address}
+                json={"address": address},
+                timeout=self.timeout
             )
             return self._handle_response(response)
         except Exception as e:
@@ -184,7 +285,7 @@ class ApiClient:
             dict: Response message
         """
         try:
-            response = self.session.post(f"{self.base_url}/game/start")
+            response = self.session.post(f"{self.base_url}/game/start", timeout=self.timeout)
             return self._handle_response(response)
         except Exception as e:
             logger.error(f"Failed to start game: {e}")
@@ -198,7 +299,7 @@ class ApiClient:
             dict: Response message
         """
         try:
-            response = self.session.post(f"{self.base_url}/game/end")
+            response = self.session.post(f"{self.base_url}/game/end", timeout=self.timeout)
             return self._handle_response(response)
         except Exception as e:
             logger.error(f"Failed to end game: {e}")
@@ -215,16 +316,23 @@ class ApiClient:
             dict: Response message
         """
         try:
-            response = self.session.post(f"{self.base_url}/broadcast/{equipment_id}")
+            response = self.session.post(f"{self.base_url}/broadcast/{equipment_id}", timeout=self.timeout)
             return self._handle_response(response)
         except Exception as e:
             logger.error(f"Failed to broadcast equipment ID: {e}")
             return {"error": str(e)}
     
-    def get_game_state(self) -> Dict:
+    def get_game_state(self, since: Optional[int] = None, epoch: Optional[str] = None) -> Dict:
         """
         Get current game state including all player scores and team totals.
         
+        Args:
+            since (int, optional): State version already held. Only players changed
+                after it are returned ("full": false), or {"unchanged": true} if
+                nothing changed.
+            epoch (str, optional): "epoch" of the response that version came from;
+                a different epoch (backend restarted) returns the full scoreboard.
+        
         Returns:
             dict: Game state data with structure:
             {
@@ -233,16 +341,88 @@ class ApiClient:
                     "players": [{"equipment_id": 1, "codename": "Player1", "score": 10, "hit_base": false}],
                     "total_score": 10
                 },
-                "green_team": {...}
+                "green_team": {...},
+                "epoch": "3f2a9c1b7d4e",
+                "version": 12,
+                "full": true
             }
         """
         try:
-            response = self.session.get(f"{self.base_url}/game/state")
+            params = {}
+            if since is not None:
+                params['since'] = since
+                if epoch is not None:
+                    params['epoch'] = epoch
+            response = self.session.get(f"{self.base_url}/game/state", params=params, timeout=self.timeout)
+            if response.status_code == 304:
+                return {"unchanged": True, "version": since}
             return self._handle_response(response)
         except Exception as e:
             logger.error(f"Failed to get game state: {e}")
             return {"error": str(e)}
     
+    def get_game_events(self, since: Optional[int] = None, wait: Optional[float] = None) -> Dict:
+        """
+        Get play-by-play events after a sequence number.
+        
+        Args:
+            since (int, optional): Sequence number of the last event already seen
+                (None for the most recent events)
+            wait (float, optional): Long-poll: let the server hold the request up to
+                this many seconds until a new event arrives
+        
+        Returns:
+            dict: {"events": [...], "missed": 0, "last_seq": 42}. If the server has
+            no long-poll slot free it answers 503 with Retry-After; this call then
+            returns at once with an error and "retry_after" (seconds), and the caller
+            schedules the next poll (e.g. with after() or on its worker) that much later.
+        """
+        params = {}
+        if since is not None:
+            params['since'] = since
+        if wait:
+            params['wait'] = wait
+        
+        try:
+            response = self.session.get(f"{self.base_url}/game/events", params=params,
+                                        timeout=(wait or 0) + 5)
+            if response.status_code == 503 and 'Retry-After' in response.headers:
+                return {"error": "Server busy", "retry_after": float(response.headers['Retry-After']),
+                        "events": []}
+            return self._handle_response(response)
+        except Exception as e:
+            logger.error(f"Failed to get game events: {e}")
+            return {"error": str(e), "events": []}
+    
+    def get_game_snapshot(self, state_since: Optional[int] = None, events_since: Optional[int] = None,
+                          state_epoch: Optional[str] = None) -> Dict:
+        """
+        Get score changes and new events together from one consistent read.
+        
+        Args:
+            state_since (int, optional): State version already held
+            events_since (int, optional): Sequence number of the last event already seen
+            state_epoch (str, optional): Epoch state_since came from (full state if it doesn't match)
+        
+        Returns:
+            dict: {"state": <game state, full or delta, or None if unchanged>,
+                   "events": {"events": [...], "missed": 0, "last_seq": 42}}
+        """
+        params = {}
+        if state_since is not None:
+            params['state_since'] = state_since
+        if state_epoch is not None:
+            params['state_epoch'] = state_epoch
+        if events_since is not None:
+            params['events_since'] = events_since
+        
+        try:
+            response = self.session.get(f"{self.base_url}/game/snapshot", params=params, timeout=self.timeout)
+            return self._handle_response(response)
+        except Exception as e:
+            logger.error(f"Failed to get game snapshot: {e}")
+            return {"error": str(e)}
+    
     def reset_game(self) -> Dict:
         """
         Reset game state (scores, base hits) without clearing players.
@@ -251,12 +431,29 @@ class ApiClient:
             dict: Response message
         """
         try:
-            response = self.session.post(f"{self.base_url}/game/reset")
+            response = self.session.post(f"{self.base_url}/game/reset", timeout=self.timeout)
             return self._handle_response(response)
         except Exception as e:
             logger.error(f"Failed to reset game: {e}")
             return {"error": str(e)}
     
+    def stream_game_updates(self, on_state: Callable[[Dict], None], on_events: Callable[[Dict], None]) -> "GameStreamSubscriber":
+        """
+        Subscribe to pushed score deltas and events from /game/stream.
+        
+        Args:
+            on_state: Called with each /game/state-shaped payload (full or delta)
+            on_events: Called with {"events": [...], "missed": n, "last_seq": n}
+            
+        Returns:
+            GameStreamSubscriber: The started subscriber (call stop() when done)
+        
+        Callbacks run on the subscriber's background thread.
+        """
+        subscriber = GameStreamSubscriber(self.base_url, on_state, on_events, session=self.session)
+        subscriber.start()
+        return subscriber
+    
     # System Status Endpoint
     
     def check_health(self) -> Dict:
@@ -267,13 +464,119 @@ class ApiClient:
             dict: Health status data
         """
         try:
-            response = self.session.get(f"{self.base_url}/health")
+            response = self.session.get(f"{self.base_url}/health", timeout=self.timeout)
             return self._handle_response(response)
         except Exception as e:
             logger.error(f"Failed to check health: {e}")
             return {"error": str(e), "status": "unhealthy"}
 
 
+class GameStreamSubscriber:
+    """
+    Background subscriber for the /game/stream server-sent event stream.
+    Reconnects automatically and resumes from the last state version and
+    event sequence it has seen.
+    """
+    
+    def __init__(self, base_url, on_state, on_events, session=None, reconnect_delay=2.0, read_timeout=45):
+        """
+        Args:
+            base_url (str): Base URL of the backend server
+            on_state: Called with each state payload (full or delta)
+            on_events: Called with each events payload
+            session: requests.Session to stream over (defaults to a new one)
+            reconnect_delay (float): Seconds to wait before reconnecting
+            read_timeout (float): Seconds without data (heartbeats included) before reconnecting
+        """
+        self.base_url = base_url
+        self.on_state = on_state
+        self.on_events = on_events
+        self.reconnect_delay = reconnect_delay
+        self.read_timeout = read_timeout
+        self.session = session or requests.Session()
+        self.state_version = None
+        self.state_epoch = None
+        self.last_seq = None
+        self.connected = False
+        self.retry_after = None  # server-requested reconnect delay after a 503 (all stream slots busy)
+        self._stop = threading.Event()
+        self._thread = None
+    
+    def start(self):
+        """Start the subscriber thread"""
+        self._thread = threading.Thread(target=self._run, daemon=True, name="game-stream")
+        self._thread.start()
+    
+    def stop(self):
+        """Stop the subscriber (takes effect at the next message or heartbeat)"""
+        self._stop.set()
+    
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self._consume()
+            except Exception as e:
+                logger.debug(f"Game stream disconnected: {e}")
+            self.connected = False
+            delay = max(self.reconnect_delay, self.retry_after or 0)
+            self.retry_after = None
+            self._stop.wait(delay)
+    
+    def _consume(self):
+        params = {}
+        if self.state_version is not None:
+            params['state_since'] = self.state_version
+        if self.state_epoch is not None:
+            params['state_epoch'] = self.state_epoch
+        if self.last_seq is not None:
+            params['since'] = self.last_seq
+        
+        with self.session.get(f"{self.base_url}/game/stream", params=params, stream=True,
+                              timeout=(3.05, self.read_timeout)) as response:
+            if response.status_code == 503 and 'Retry-After' in response.headers:
+                self.retry_after = float(response.headers['Retry-After'])
+                logger.info(f"Game stream busy, reconnecting in {self.retry_after}s")
+                return
+            response.raise_for_status()
+            self.connected = True
+            event_type, data_lines = "message", []
+            
+            for line in response.iter_lines(decode_unicode=True):
+                if self._stop.is_set():
+                    return
+                if not line:
+                    # Blank line ends one event
+                    if data_lines:
+                        self._dispatch(event_type, "\n".join(data_lines))
+                    event_type, data_lines = "message", []
+                    continue
+                if line.startswith(":"):
+                    continue  # heartbeat / comment
+                
+                field, _, value = line.partition(":")
+                if value.startswith(" "):
+                    value = value[1:]
+                if field == "event":
+                    event_type = value
+                elif field == "data":
+                    data_lines.append(value)
+    
+    def _dispatch(self, event_type, data):
+        try:
+            payload = json.loads(data)
+        except json.JSONDecodeError:
+            logger.error(f"Invalid stream payload: {data}")
+            return
+        
+        if event_type == "state":
+            self.state_version = payload.get("version")
+            self.state_epoch = payload.get("epoch")
+            self.on_state(payload)
+        elif event_type == "events":
+            self.last_seq = payload.get("last_seq", self.last_seq)
+            self.on_events(payload)
+
+
 # Helper functions for team management
 
 def team_id_generator(team_name: str, start_index: int = 0) -> int:
@@ -0,0 +1,65 @@
+import itertools
+import logging
+import queue
+import threading
+
+from .client import get_shared_client
+
+logger = logging.getLogger(__name__)
+
+
+class NetworkWorker:
+    """
+    Runs ApiClient calls on a background thread so the Tk main loop never
+    blocks on HTTP. Results are posted to a thread-safe queue that the UI
+    drains with after(); each result carries a per-kind sequence number so
+    stale responses can be dropped instead of rendered out of order.
+    """
+
+    def __init__(self, results: queue.Queue, base_url="http://localhost:5000"):
+        """
+        Args:
+            results: Queue that receives ('response', kind, seq, callback, result) tuples
+            base_url (str): Base URL of the backend server
+        """
+        self.results = results
+        self.api_client = get_shared_client(base_url)  # shared pooled keep-alive session
+        self.requests = queue.Queue()
+        self.in_flight = set()  # kinds submitted but not yet answered
+        self._sequence = itertools.count(1)
+        self._thread = threading.Thread(target=self._run, daemon=True, name="network-worker")
+        self._thread.start()
+
+    def submit(self, kind, method, *args, callback=None, **kwargs):
+        """
+        Queue an ApiClient call.
+
+        Args:
+            kind (str): Request category used for stale-response tracking (e.g. "snapshot")
+            method (str): Name of the ApiClient method to call
+            callback: Called on the UI thread with the result dict (optional)
+
+        Returns:
+            int: Sequence number of this request
+        """
+        seq = next(self._sequence)
+        self.in_flight.add(kind)
+        self.requests.put((kind, seq, method, args, kwargs, callback))
+        return seq
+
+    def stop(self):
+        """Stop the worker after the requests already queued."""
+        self.requests.put(None)
+
+    def _run(self):
+        while True:
+            item = self.requests.get()
+            if item is None:
+                return
+            kind, seq, method, args, kwargs, callback = item
+            try:
+                result = getattr(self.api_client, method)(*args, **kwargs)
+            except Exception as e:
+                logger.error(f"Network request {method} failed: {e}")
+                result = {"error": str(e)}
+            self.results.put(('response', kind, seq, callback, result))
@@ -1,29 +1,35 @@
 import tkinter as tk
 from PIL import Image, ImageTk
+from frontend.tick_scheduler import TickScheduler
 
 class CountdownTimer:
-    def __init__(self, window, images, duration, next_screen=None):
+    def __init__(self, window, images, duration, next_screen=None, frame_cache=None, start=None):
         self.window = window
         self.images = images
         self.duration = duration * 1000
         self.next_screen = next_screen
-        self.index = 0
+        self.frame_cache = frame_cache  # preloaded FrameCache, so ticks only swap the label image
         self.frame = tk.Frame(window)
         self.frame.pack(expand=True, fill="both")
         self.label = tk.Label(self.frame)
         self.label.pack(expand=True)
-        self._show_next_image()
 
-    def _show_next_image(self):
-        if self.index < len(self.images):
-            img = Image.open(self.images[self.index])
+        # Frame deadlines are fixed from the start time (time.monotonic()), so slow frames don't add up
+        self.scheduler = TickScheduler(window, self.duration, self._show_image, ticks=len(images),
+                                       on_finish=self._finish, start=start, name="Countdown")
+        self.scheduler.start()
+
+    def _show_image(self, index):
+        if self.frame_cache:
+            photo = self.frame_cache.get_photo(self.images[index])
+        else:
+            img = Image.open(self.images[index])
             img = img.resize((1300, 800))
             photo = ImageTk.PhotoImage(img)
-            self.label.config(image=photo)
-            self.label.image = photo
-            self.index += 1
-            self.window.after(self.duration, self._show_next_image)
-        else:
-            self.frame.destroy()
-            if self.next_screen:
-                self.next_screen(self.window)
\ No newline at end of file
+        self.label.config(image=photo)
+        self.label.image = photo
+
+    def _finish(self):
+        self.frame.destroy()
+        if self.next_screen:
+            self.next_screen(self.window)
@@ -0,0 +1,125 @@
+import os
+import threading
+import logging
+from PIL import Image, ImageTk
+
+logger = logging.getLogger(__name__)
+
+# Resized copies of the splash logo and countdown frames survive restarts here
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "photon", "frames")
+
+
+def load_resized(path, size, cache_dir=None):
+    """
+    Open an image and resize it, going through the on-disk cache if one is given.
+    Cached copies are raw PPM files keyed by source name, mtime and target size,
+    so editing an asset or changing the size never serves a stale frame.
+
+    Args:
+        path (str): Source image path
+        size (tuple): Target (width, height)
+        cache_dir (str, optional): Directory for resized copies
+
+    Returns:
+        PIL.Image.Image: The resized image
+    """
+    cache_path = None
+    if cache_dir:
+        stem = os.path.splitext(os.path.basename(path))[0]
+        mtime = int(os.path.getmtime(path))
+        cache_path = os.path.join(cache_dir, f"{stem}-{size[0]}x{size[1]}-{mtime}.ppm")
+        if os.path.exists(cache_path):
+            try:
+                image = Image.open(cache_path)
+                image.load()
+                return image
+            except Exception as e:
+                logger.warning(f"Ignoring unreadable cached frame {cache_path}: {e}")
+
+    image = Image.open(path).convert("RGB").resize(size)
+
+    if cache_path:
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            # Write then rename so a concurrent reader never sees a partial file
+            tmp_path = f"{cache_path}.tmp"
+            image.save(tmp_path, "PPM")
+            os.replace(tmp_path, cache_path)
+        except Exception as e:
+            logger.warning(f"Could not write frame cache {cache_path}: {e}")
+    return image
+
+
+class FrameCache:
+    """
+    Decodes and resizes a list of frames (the countdown images) in a
+    background thread, then turns them into PhotoImages on the Tk thread a
+    few at a time, so showing a frame later is only a label.config call.
+    """
+
+    def __init__(self, paths, size=(1300, 800), cache_dir=None):
+        """
+        Args:
+            paths (list): Image paths in display order
+            size (tuple): Target (width, height) for every frame
+            cache_dir (str, optional): On-disk cache for resized frames
+        """
+        self.paths = list(paths)
+        self.size = size
+        self.cache_dir = cache_dir
+        self.images = {}  # path -> resized PIL image (filled by the loader thread, dropped once converted)
+        self.photos = {}  # path -> PhotoImage (created on the Tk thread only)
+        self.loaded = threading.Event()
+        self._thread = None
+
+    def preload(self):
+        """Start decoding and resizing every frame in a background thread."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._load_all, daemon=True, name="frame-cache")
+            self._thread.start()
+
+    def realize(self, window, interval=50):
+        """
+        Convert decoded frames to PhotoImages on the Tk thread, one per
+        `interval` ms, until every frame is ready.
+        """
+        # Read `loaded` before scanning, so a frame decoded in between is still picked up next time
+        loaded = self.loaded.is_set()
+        pending = [path for path in self.paths if path in self.images]
+        if pending:
+            path = pending[0]
+            # The decoded frame is only needed until its PhotoImage exists
+            image = self.images.pop(path)
+            if path not in self.photos:
+                self.photos[path] = ImageTk.PhotoImage(image)
+
+        # Keep going until the loader is done and everything it produced is converted
+        if len(pending) > 1 or not loaded:
+            window.after(interval, self.realize, window, interval)
+
+    def get_photo(self, path):
+        """
+        Get the PhotoImage for a frame (Tk thread only). Falls back to decoding
+        it on the spot if the background work has not reached it yet.
+        """
+        photo = self.photos.get(path)
+        if photo is None:
+            image = self.images.pop(path, None)
+            if image is None:
+                image = load_resized(path, self.size, self.cache_dir)
+            photo = ImageTk.PhotoImage(image)
+            self.photos[path] = photo
+        return photo
+
+    def _load_all(self):
+        decoded = 0
+        for path in self.paths:
+            if path in self.photos:
+                continue  # already shown (decoded on demand)
+            try:
+                self.images[path] = load_resized(path, self.size, self.cache_dir)
+                decoded += 1
+            except Exception as e:
+                logger.error(f"Failed to preload frame {path}: {e}")
+        self.loaded.set()
+        logger.info(f"Preloaded {decoded} of {len(self.paths)} frames")
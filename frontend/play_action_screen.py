@@ -1,12 +1,16 @@
 import tkinter as tk
-import requests
 import logging
+import queue
+import time
 from PIL import Image, ImageTk
+from frontend.api import NetworkWorker, get_shared_client
+from frontend.tick_scheduler import TickScheduler
 
 logger = logging.getLogger(__name__)
 
 class PlayActionScreen(tk.Frame):
-    def __init__(self, parent, players_red, players_green, api_url="http://localhost:5000", return_callback=None):
+    def __init__(self, parent, players_red, players_green, api_url="http://localhost:5000", return_callback=None,
+                 use_stream=True, max_log_lines=200, game_start=None):
         super().__init__(parent, bg = "black")
         
         # Store callback for returning to player entry
@@ -18,13 +22,43 @@ class PlayActionScreen(tk.Frame):
         self.api_url = api_url
         
         # Timer variables
-        self.time_remaining = 6 * 60  # 6 minutes in seconds
+        self.game_length = 6 * 60  # 6 minutes in seconds
+        self.time_remaining = self.game_length
         self.timer_label = None
+        self.game_start = game_start  # time.monotonic() the clock counts from (defaults to now)
+        self.game_clock = None
         
         # Score tracking
         self.score_labels = {}  # codename -> label widget
         self.player_equipment_map = {}  # codename -> equipment_id
-        self.last_event_timestamp = 0  # Track last event we've seen
+        self.last_event_seq = None  # Sequence number of the last event we've seen
+        
+        # Local copy of the scoreboard, kept current from /game/state deltas
+        self.state_version = None  # last backend state version applied
+        self.state_epoch = None  # backend epoch that version belongs to (changes when the backend restarts)
+        self.scoreboard_players = {}  # equipment_id -> (team, player row)
+        self.team_totals = {'red': 0, 'green': 0}
+        
+        # Pushed updates from /game/stream and HTTP results from the network worker
+        # (filled on background threads, drained on the Tk thread)
+        self.use_stream = use_stream
+        self.stream = None
+        self.live_updates = queue.Queue()
+        self.network = NetworkWorker(self.live_updates, api_url)
+        self.latest_response_seq = {}  # request kind -> sequence of the newest response applied
+        
+        # Action log size cap (oldest lines are trimmed in batches of log_trim_batch)
+        self.max_log_lines = max_log_lines
+        self.log_trim_batch = max(1, max_log_lines // 10)
+        self.log_line_count = 0
+        
+        # Pooled scoreboard rows: team -> {equipment_id: row widgets and last shown values}
+        self.score_rows = {'red': {}, 'green': {}}
+        self.row_order = {'red': [], 'green': []}  # equipment_ids in the order rows are packed
+        
+        # Scoreboard render timing (render_timing_callback, if set, gets each update's cost in ms)
+        self.render_stats = {'updates': 0, 'last_ms': 0.0, 'max_ms': 0.0, 'total_ms': 0.0}
+        self.render_timing_callback = None
         
         # Team total labels
         self.red_team_total_label = None
@@ -48,11 +82,21 @@ class PlayActionScreen(tk.Frame):
         self.build_top_half()
         self.build_bottom_half()
         
-        # Start game timer immediately (pregame countdown already happened)
-        self.update_game_timer()
-        # Start polling immediately
-        self.poll_game_state()
-        self.poll_game_events()
+        # Start game timer immediately (pregame countdown already happened); each second's
+        # deadline is fixed from game_start so the clock stays in step with the music cues
+        self.game_clock = TickScheduler(self, 1000, self.update_game_timer, ticks=self.game_length,
+                                        on_finish=self.on_game_clock_finished, start=self.game_start,
+                                        name="Game clock")
+        self.game_clock.start()
+        # Live scores and events: pushed over /game/stream, or polled from /game/snapshot if streaming is disabled
+        if self.use_stream:
+            self.stream = get_shared_client(self.api_url).stream_game_updates(
+                on_state=lambda data: self.live_updates.put(('state', data)),
+                on_events=lambda data: self.live_updates.put(('events', data))
+            )
+        else:
+            self.poll_snapshot()
+        self.drain_live_updates()
 
         # load base icon
         try:
@@ -173,97 +217,168 @@ class PlayActionScreen(tk.Frame):
         """Handle returning to player entry screen and reset game"""
         try:
             # Stop any ongoing timers
-            self.after_cancel(self.update_game_timer)
+            if self.game_clock:
+                self.game_clock.cancel()
         except:
             pass
         
-        # End the game first (broadcasts code 221 to stop traffic generator)
-        try:
-            requests.post(f"{self.api_url}/game/end", timeout=2)
-            logger.info("Game ended - code 221 broadcasted (stops traffic generator)")
-        except Exception as e:
-            logger.error(f"Failed to end game: {e}")
+        # Stop the live update stream
+        if self.stream:
+            self.stream.stop()
         
-        # Then reset game state (scores back to zero)
-        try:
-            requests.post(f"{self.api_url}/game/reset", timeout=1)
-            logger.info("Game reset - all scores cleared")
-        except Exception as e:
-            logger.error(f"Failed to reset game: {e}")
+        # End the game first (broadcasts code 221 to stop traffic generator), then reset
+        # game state (scores back to zero). The worker sends them in order in the background.
+        self.network.submit('end_game', 'end_game')
+        self.network.submit('reset_game', 'reset_game')
+        self.network.stop()
+        logger.info("Game end and reset requested")
         
         # Call the return callback if provided
         if self.return_callback:
             self.return_callback()
     
 
-    def update_game_timer(self):
-        """Update the countdown timer every second"""
-        if self.time_remaining <= 0:
-            self.timer_label.config(text="Time Remaining: 00:00", fg="red")
-            
-            # Call backend to end game (broadcasts code 221 three times)
-            try:
-                requests.post(f"{self.api_url}/game/end", timeout=2)
-                logger.info("Game ended - code 221 broadcasted 3 times")
-            except Exception as e:
-                logger.error(f"Failed to end game: {e}")
-            
-            return
-
+    def update_game_timer(self, tick):
+        """Update the countdown timer every second (tick = seconds since the game started)"""
+        self.time_remaining = self.game_length - tick
         minutes = self.time_remaining // 60
         seconds = self.time_remaining % 60
         time_update = f"Time Remaining: {minutes:02d}:{seconds:02d}"
 
         self.timer_label.config(text=time_update)
 
-        self.time_remaining -= 1
-        self.after(1000, self.update_game_timer)
+    def on_game_clock_finished(self):
+        """Show 00:00 and end the game when the clock runs out"""
+        self.time_remaining = 0
+        self.timer_label.config(text="Time Remaining: 00:00", fg="red")
+
+        # Call backend to end game (broadcasts code 221 three times)
+        self.network.submit('end_game', 'end_game', callback=self.on_game_ended)
     
-    def poll_game_state(self):
-        """Poll the backend for current game state (scores)"""
-        try:
-            response = requests.get(f"{self.api_url}/game/state", timeout=1)
-            if response.status_code == 200:
-                data = response.json()
-                self.update_scores(data)
-        except Exception as e:
-            logger.debug(f"Error polling game state: {e}")
+    def on_game_ended(self, result):
+        """Log the result of the end-of-game request"""
+        if "error" in result:
+            logger.error(f"Failed to end game: {result['error']}")
+        else:
+            logger.info(result.get("message", "Game ended"))
+    
+    def poll_snapshot(self):
+        """Poll the backend for score changes and new events in one consistent request"""
+        # Skip this round if the previous poll hasn't come back yet
+        if 'snapshot' not in self.network.in_flight:
+            self.network.submit('snapshot', 'get_game_snapshot', self.state_version, self.last_event_seq,
+                                self.state_epoch, callback=self.on_snapshot)
         
-        # Poll every 2 seconds
-        self.after(2000, self.poll_game_state)
+        # Poll every 1 second
+        self.after(1000, self.poll_snapshot)
     
-    def poll_game_events(self):
-        """Poll the backend for new game events"""
+    def on_snapshot(self, data):
+        """Apply a /game/snapshot response"""
+        if "error" in data:
+            logger.debug(f"Error polling game snapshot: {data['error']}")
+            return
+        # state is None when no scores changed since our version
+        if data.get('state') is not None:
+            self.update_scores(self.merge_game_state(data['state']))
+        self.apply_events(data.get('events', {}))
+    
+    def drain_live_updates(self):
+        """Apply every stream update and network response queued since the last drain"""
         try:
-            params = {}
-            if self.last_event_timestamp > 0:
-                params['since'] = self.last_event_timestamp
-            
-            response = requests.get(f"{self.api_url}/game/events", params=params, timeout=1)
-            if response.status_code == 200:
-                data = response.json()
-                events = data.get('events', [])
-                
-                for event in events:
-                    self.add_event_to_log(event)
-                    # Update last timestamp
-                    if event['timestamp'] > self.last_event_timestamp:
-                        self.last_event_timestamp = event['timestamp']
-                        
-        except Exception as e:
-            logger.debug(f"Error polling game events: {e}")
+            while True:
+                item = self.live_updates.get_nowait()
+                if item[0] == 'state':
+                    self.update_scores(self.merge_game_state(item[1]))
+                elif item[0] == 'events':
+                    self.apply_events(item[1])
+                else:
+                    self.apply_response(*item[1:])
+        except queue.Empty:
+            pass
         
-        # Poll every 1 second for events
-        self.after(1000, self.poll_game_events)
+        self.after(100, self.drain_live_updates)
+    
+    def apply_response(self, kind, seq, callback, result):
+        """Hand a network worker result to its callback, dropping responses older than one already applied"""
+        self.network.in_flight.discard(kind)
+        if seq < self.latest_response_seq.get(kind, 0):
+            logger.debug(f"Dropping stale {kind} response #{seq}")
+            return
+        self.latest_response_seq[kind] = seq
+        if callback:
+            callback(result)
+    
+    def apply_events(self, data):
+        """Add a batch of events ({events, missed, last_seq}) to the action log and advance our cursor"""
+        events = list(data.get('events', []))
+        
+        # Our cursor fell out of the backend's event ring
+        missed = data.get('missed', 0)
+        if missed:
+            events.insert(0, {'type': 'missed', 'message': f"({missed} earlier events not shown)"})
+        
+        self.add_events_to_log(events)
+        
+        # Advance the cursor
+        self.last_event_seq = data.get('last_seq', self.last_event_seq)
     
     def start_flashing(self):
         """Toggle flash state every 500ms for winning team effect"""
         self.flash_state = not self.flash_state
+        self.update_team_totals(self.team_totals['red'], self.team_totals['green'])
         self.after(500, self.start_flashing)
     
+    def merge_game_state(self, data):
+        """
+        Apply a full or delta /game/state response to the local scoreboard.
+        
+        Returns:
+            dict: Full game state in the /game/state shape (players sorted highest first)
+        """
+        if data.get('full', True):
+            self.scoreboard_players = {}
+        
+        for team in ('red', 'green'):
+            team_data = data.get(f'{team}_team', {})
+            for player in team_data.get('players', []):
+                self.scoreboard_players[player['equipment_id']] = (team, player)
+            self.team_totals[team] = team_data.get('total_score', 0)
+        self.state_version = data.get('version')
+        self.state_epoch = data.get('epoch')
+        
+        game_data = {'is_active': data.get('is_active', False)}
+        for team in ('red', 'green'):
+            players = [player for player_team, player in self.scoreboard_players.values() if player_team == team]
+            players.sort(key=lambda player: (-player['score'], player['equipment_id']))
+            game_data[f'{team}_team'] = {'players': players, 'total_score': self.team_totals[team]}
+        return game_data
+    
+    def update_team_totals(self, red_total, green_total):
+        """Update team total labels, flashing the winning team's total"""
+        red_winning = red_total > green_total
+        green_winning = green_total > red_total
+        
+        if self.red_team_total_label:
+            if red_winning and self.flash_state:
+                self.red_team_total_label.config(text=f"Total: {red_total}", fg="#FFFFFF")  # White (flash)
+            elif red_winning:
+                self.red_team_total_label.config(text=f"Total: {red_total}", fg="#FF0000")  # Red (winning)
+            else:
+                self.red_team_total_label.config(text=f"Total: {red_total}", fg="#FFD700")  # Gold (not winning)
+        
+        if self.green_team_total_label:
+            if green_winning and self.flash_state:
+                self.green_team_total_label.config(text=f"Total: {green_total}", fg="#FFFFFF")  # White (flash)
+            elif green_winning:
+                self.green_team_total_label.config(text=f"Total: {green_total}", fg="#00FF00")  # Green (winning)
+            else:
+                self.green_team_total_label.config(text=f"Total: {green_total}", fg="#FFD700")  # Gold (not winning)
+    
     def update_scores(self, game_data):
         """Update score labels with current scores (sorted by score, with team totals)"""
         try:
+            start = time.perf_counter()
+            
             # Update red team
             red_team_data = game_data.get('red_team', {})
             red_players = red_team_data.get('players', [])
@@ -274,90 +389,130 @@ class PlayActionScreen(tk.Frame):
             green_players = green_team_data.get('players', [])
             green_total = green_team_data.get('total_score', 0)
             
-            # Determine winning team
-            red_winning = red_total > green_total
-            green_winning = green_total > red_total
-            
-            # Update red team total with flashing if winning
-            if self.red_team_total_label:
-                if red_winning and self.flash_state:
-                    self.red_team_total_label.config(text=f"Total: {red_total}", fg="#FFFFFF")  # White (flash)
-                elif red_winning:
-                    self.red_team_total_label.config(text=f"Total: {red_total}", fg="#FF0000")  # Red (winning)
-                else:
-                    self.red_team_total_label.config(text=f"Total: {red_total}", fg="#FFD700")  # Gold (not winning)
-            
-            # Rebuild red team player list (already sorted highest to lowest by backend)
-            for widget in self.red_players_frame.winfo_children():
-                widget.destroy()
+            # Update team totals (flashing the winning team)
+            self.update_team_totals(red_total, green_total)
             
-            for player in red_players:
-                codename = player['codename']
-                score = player['score']
-                hit_base = player.get('hit_base', False)
-                
-                row = tk.Frame(self.red_players_frame, bg = "#1a1a1a")
-                row.pack(fill = "x", pady = 3)
-                
-                # show base icon after a player hits the base
-                if hit_base and self.base_icon:
-                    icon_label = tk.Label(row, image = self.base_icon, bg = "#1a1a1a")
-                    icon_label.pack(side = "left", padx = (10, 5))
-
-                tk.Label(row, text = codename, font = ("Arial", 16), fg = "white", bg = "#1a1a1a", anchor = "e").pack(side = "left", padx = 10)
-                tk.Label(row, text = str(score), font = ("Arial", 16, "bold"), fg = "yellow", bg = "#1a1a1a", anchor = "e").pack(side = "right", padx = 10)
-            
-            # Update green team total with flashing if winning
-            if self.green_team_total_label:
-                if green_winning and self.flash_state:
-                    self.green_team_total_label.config(text=f"Total: {green_total}", fg="#FFFFFF")  # White (flash)
-                elif green_winning:
-                    self.green_team_total_label.config(text=f"Total: {green_total}", fg="#00FF00")  # Green (winning)
-                else:
-                    self.green_team_total_label.config(text=f"Total: {green_total}", fg="#FFD700")  # Gold (not winning)
+            # Update player rows in place (already sorted highest to lowest by backend)
+            self.update_team_rows('red', self.red_players_frame, red_players, name_anchor = "e")
+            self.update_team_rows('green', self.green_players_frame, green_players, name_anchor = "w")
             
-            # Rebuild green team player list (already sorted highest to lowest by backend)
-            for widget in self.green_players_frame.winfo_children():
-                widget.destroy()
-            
-            for player in green_players:
-                codename = player['codename']
-                score = player['score']
-                hit_base = player.get('hit_base', False)
-                
-                row = tk.Frame(self.green_players_frame, bg = "#1a1a1a")
-                row.pack(fill = "x", pady = 3)
-
-                # show base icon after a player hits the base
-                if hit_base and self.base_icon:
-                    icon_label = tk.Label(row, image = self.base_icon, bg = "#1a1a1a")
-                    icon_label.pack(side = "left", padx = (10, 5))
-                
-                tk.Label(row, text = codename, font = ("Arial", 16), fg = "white", bg = "#1a1a1a", anchor = "w").pack(side = "left", padx = 10)
-                tk.Label(row, text = str(score), font = ("Arial", 16, "bold"), fg = "yellow", bg = "#1a1a1a", anchor = "e").pack(side = "right", padx = 10)
+            self.record_render_time((time.perf_counter() - start) * 1000)
                     
         except Exception as e:
             logger.error(f"Error updating scores: {e}")
     
+    def update_team_rows(self, team, parent, players, name_anchor):
+        """
+        Sync a team's pooled row widgets (keyed by equipment_id) with the sorted player list.
+        Only changed labels are reconfigured, and rows are repacked only if the order changed.
+        """
+        rows = self.score_rows[team]
+        order = [player['equipment_id'] for player in players]
+        
+        # Drop rows for players no longer on this team
+        for equipment_id in set(rows) - set(order):
+            rows.pop(equipment_id)['frame'].destroy()
+        
+        for player in players:
+            row = rows.get(player['equipment_id'])
+            if row is None:
+                row = self.create_score_row(parent, name_anchor)
+                rows[player['equipment_id']] = row
+            
+            if row['codename'] != player['codename']:
+                row['name_label'].config(text = player['codename'])
+                row['codename'] = player['codename']
+            
+            if row['score'] != player['score']:
+                row['score_label'].config(text = str(player['score']))
+                row['score'] = player['score']
+            
+            # show base icon after a player hits the base
+            hit_base = bool(player.get('hit_base', False) and self.base_icon)
+            if row['hit_base'] != hit_base:
+                if hit_base:
+                    row['icon_label'] = tk.Label(row['frame'], image = self.base_icon, bg = "#1a1a1a")
+                    row['icon_label'].pack(side = "left", padx = (10, 5), before = row['name_label'])
+                else:
+                    row['icon_label'].destroy()
+                    row['icon_label'] = None
+                row['hit_base'] = hit_base
+        
+        if order != self.row_order[team]:
+            for equipment_id in order:
+                rows[equipment_id]['frame'].pack_forget()
+            for equipment_id in order:
+                rows[equipment_id]['frame'].pack(fill = "x", pady = 3)
+            self.row_order[team] = order
+    
+    def create_score_row(self, parent, name_anchor):
+        """Create the widgets for one player row (packed later by update_team_rows)"""
+        frame = tk.Frame(parent, bg = "#1a1a1a")
+        name_label = tk.Label(frame, text = "", font = ("Arial", 16), fg = "white", bg = "#1a1a1a", anchor = name_anchor)
+        name_label.pack(side = "left", padx = 10)
+        score_label = tk.Label(frame, text = "", font = ("Arial", 16, "bold"), fg = "yellow", bg = "#1a1a1a", anchor = "e")
+        score_label.pack(side = "right", padx = 10)
+        return {
+            'frame': frame,
+            'icon_label': None,
+            'name_label': name_label,
+            'score_label': score_label,
+            'codename': None,
+            'score': None,
+            'hit_base': False
+        }
+    
+    def record_render_time(self, elapsed_ms):
+        """Timing hook: track per-update scoreboard render cost"""
+        stats = self.render_stats
+        stats['updates'] += 1
+        stats['last_ms'] = elapsed_ms
+        stats['total_ms'] += elapsed_ms
+        stats['max_ms'] = max(stats['max_ms'], elapsed_ms)
+        logger.debug(f"Scoreboard update took {elapsed_ms:.2f} ms "
+                     f"(avg {stats['total_ms'] / stats['updates']:.2f} ms, max {stats['max_ms']:.2f} ms)")
+        if self.render_timing_callback:
+            self.render_timing_callback(elapsed_ms)
+    
     def add_event_to_log(self, event):
         """Add a game event to the action log"""
+        self.add_events_to_log([event])
+    
+    def add_events_to_log(self, events):
+        """
+        Add a batch of game events to the action log with a single insert and scroll,
+        trimming the oldest lines once the log grows past max_log_lines.
+        """
+        if not events:
+            return
         try:
-            event_type = event.get('type', 'unknown')
-            message = event.get('message', '')
-            
-            # Determine tag based on event type
-            if event_type == 'friendly_fire':
-                tag = "friendly_fire"
-            elif event_type == 'base_hit':
-                tag = "base_hit"
-            else:
-                tag = "normal_hit"
+            # Interleaved text/tag pairs so the whole batch is one insert call
+            chunks = []
+            for event in events:
+                event_type = event.get('type', 'unknown')
+                message = event.get('message', '')
+                
+                # Determine tag based on event type
+                if event_type == 'friendly_fire':
+                    tag = "friendly_fire"
+                elif event_type == 'base_hit':
+                    tag = "base_hit"
+                else:
+                    tag = "normal_hit"
+                chunks.extend((f"• {message}\n", tag))
             
             # Enable text widget for editing
             self.action_text.config(state="normal")
             
-            # Add the message with appropriate styling
-            self.action_text.insert("end", f"• {message}\n", tag)
+            # Add the messages with appropriate styling
+            self.action_text.insert("end", *chunks)
+            
+            # Trim in batches (not every insert) once over the cap
+            self.log_line_count += len(events)
+            if self.log_line_count > self.max_log_lines + self.log_trim_batch:
+                excess = self.log_line_count - self.max_log_lines
+                self.action_text.delete("1.0", f"{excess + 1}.0")
+                self.log_line_count -= excess
             
             # Auto-scroll to bottom
             self.action_text.see("end")
@@ -366,4 +521,4 @@ class PlayActionScreen(tk.Frame):
             self.action_text.config(state="disabled")
             
         except Exception as e:
-            logger.error(f"Error adding event to log: {e}")
+            logger.error(f"Error adding events to log: {e}")
@@ -1,6 +1,6 @@
 import tkinter as tk
 from tkinter import messagebox, simpledialog
-from frontend.api import ApiClient, team_id_generator, equipment_id_generator
+from frontend.api import get_shared_client, team_id_generator, equipment_id_generator
 
 class PlayerEntry:
     """
@@ -8,8 +8,11 @@ class PlayerEntry:
     This class provides the core functionality for managing player entries.
     """
     
-    # Create a shared API client instance
-    api_client = ApiClient()
+    # Shared pooled API client (same keep-alive session as the rest of the frontend)
+    api_client = get_shared_client()
+    
+    # Codenames pre-resolved by "Lookup All IDs" (player_id -> codename), shared by both teams
+    resolved_codenames = {}
     
     def __init__(self, parent, team_name, team_color):
         # Create the frame for this team
@@ -132,8 +135,11 @@ class PlayerEntry:
             messagebox.showerror("Error", "Player ID must be a valid number")
             return
 
-        # First, try to fetch existing player by ID from backend
-        fetch_result = self.api_client.get_player(player_id)
+        # First, try to fetch existing player by ID from backend (skipped if already pre-resolved)
+        if player_id in self.resolved_codenames:
+            fetch_result = {"id": player_id, "codename": self.resolved_codenames[player_id]}
+        else:
+            fetch_result = self.api_client.get_player(player_id)
         if "error" not in fetch_result and "codename" in fetch_result:
             # Player exists in DB: populate the UI and inform the user
             existing_codename = fetch_result.get("codename", "")
@@ -188,6 +194,32 @@ class PlayerEntry:
         else:
             messagebox.showinfo("Success", f"{codename} added to {self.team_name} team with ID {player_id} and Hardware ID {hardware_id}")
     
+    def get_typed_ids(self):
+        """Returns (slot index, player ID) for every slot with a valid ID typed in"""
+        typed_ids = []
+        for i, id_entry in enumerate(self.player_id_entries):
+            try:
+                player_id_text = id_entry.get().strip()
+                if player_id_text:
+                    typed_ids.append((i, int(player_id_text)))
+            except ValueError:
+                continue
+        return typed_ids
+    
+    def fill_resolved_names(self, codenames):
+        """
+        Fill the name field of every slot whose ID is in codenames (player_id -> codename).
+        
+        Returns:
+            int: Number of slots filled
+        """
+        filled = 0
+        for index, player_id in self.get_typed_ids():
+            if player_id in codenames:
+                self.set_player_name(index, codenames[player_id])
+                filled += 1
+        return filled
+    
     def get_player_ids(self):
         """Returns a list of all player IDs"""
         player_ids = []
@@ -6,7 +6,8 @@ import time
 from frontend.player_entry.player_teams.red_team_entry import RedTeamEntry
 from frontend.player_entry.player_teams.green_team_entry import GreenTeamEntry
 from frontend.player_entry.game_status.start_game import StartGameButton
-from frontend.api import ApiClient, transform_players_for_ui
+from frontend.player_entry.player_entry import PlayerEntry
+from frontend.api import get_shared_client, transform_players_for_ui
 
 class PlayerEntryComponent(tk.Frame):
     """
@@ -18,8 +19,8 @@ class PlayerEntryComponent(tk.Frame):
         # Initialize the frame
         tk.Frame.__init__(self, parent)
         
-        # Initialize API client
-        self.api_client = ApiClient()
+        # Shared pooled API client
+        self.api_client = get_shared_client()
         
         # Configure grid layout for side-by-side teams
         self.columnconfigure(0, weight=1)  # Red team column
@@ -39,6 +40,9 @@ class PlayerEntryComponent(tk.Frame):
         self.clear_all_button = tk.Button(self.status_frame, text="Clear All Players", command=self.clear_all_players_backend)
         self.clear_all_button.pack(side="right", padx=10)
         
+        self.lookup_all_button = tk.Button(self.status_frame, text="Lookup All IDs", command=self.lookup_all_ids)
+        self.lookup_all_button.pack(side="right", padx=10)
+        
         # Create team instances
         self.red_team = RedTeamEntry(self)
         self.green_team = GreenTeamEntry(self)
@@ -132,6 +136,30 @@ class PlayerEntryComponent(tk.Frame):
             count = result.get("count", 0)
             self.update_status(f"Connected to server. {count} players loaded.")
     
+    def lookup_all_ids(self):
+        """Resolve every ID typed on both teams in one request and fill in the names"""
+        teams = (self.red_team, self.green_team)
+        player_ids = sorted({player_id for team in teams for _, player_id in team.get_typed_ids()})
+        if not player_ids:
+            self.update_status("No player IDs entered", "orange")
+            return
+        
+        result = self.api_client.get_players_by_ids(player_ids)
+        if "error" in result:
+            self.update_status(f"Error: {result['error']}", "red")
+            return
+        
+        codenames = {player["id"]: player["codename"] for player in result.get("players", [])}
+        PlayerEntry.resolved_codenames.update(codenames)
+        for team in teams:
+            team.fill_resolved_names(codenames)
+        
+        missing = result.get("missing", [])
+        message = f"Found {len(codenames)} of {len(player_ids)} players."
+        if missing:
+            message += f" New IDs (enter a name): {', '.join(str(player_id) for player_id in missing)}"
+        self.update_status(message, "orange" if missing else "black")
+    
     def clear_all_players_backend(self):
         """Clear all players from the backend database"""
         if messagebox.askyesno("Confirm", "Are you sure you want to clear all players?\nThis will remove them from the database."):
@@ -140,6 +168,7 @@ class PlayerEntryComponent(tk.Frame):
                 messagebox.showerror("Error", f"Failed to clear players: {result['error']}")
             else:
                 messagebox.showinfo("Success", "All players cleared successfully")
+                PlayerEntry.resolved_codenames.clear()
                 self.clear_all_entries()
     
     def update_network_address(self):
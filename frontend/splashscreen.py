@@ -1,14 +1,14 @@
 import tkinter as tk
-from PIL import Image, ImageTk
+from PIL import ImageTk
+from frontend.frame_cache import load_resized, DEFAULT_CACHE_DIR
 
 def splash_screen(window, next_screen):
     #splash screen frame
     frame = tk.Frame(window)
     frame.pack(expand=True, fill="both")
 
-    #load photon logo
-    photon_image = Image.open("frontend/assets/logo.jpg")
-    photon_image = photon_image.resize((1300, 800))
+    #load photon logo (resized copy comes from the disk cache after the first run)
+    photon_image = load_resized("frontend/assets/logo.jpg", (1300, 800), DEFAULT_CACHE_DIR)
     photo = ImageTk.PhotoImage(photon_image)
 
     label = tk.Label(frame, image=photo)
@@ -0,0 +1,127 @@
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+def schedule_at(widget, deadline, callback, *args):
+    """
+    Run a callback at a time.monotonic() deadline using widget.after().
+
+    Returns:
+        The after id (pass to widget.after_cancel to cancel)
+    """
+    delay_ms = max(0, round((deadline - time.monotonic()) * 1000))
+    return widget.after(delay_ms, callback, *args)
+
+
+class TickScheduler:
+    """
+    Fixed-rate tick source for Tk screens (countdown frames, game clock).
+    Each tick's deadline is computed from one monotonic start time rather
+    than chaining after(interval) calls, so decode/render time on one tick
+    never pushes the later ones back. If a tick runs more than a full
+    interval late the missed ticks are skipped so the display catches up.
+    """
+
+    def __init__(self, widget, interval_ms, on_tick, ticks=None, on_finish=None, start=None,
+                 late_threshold_ms=20, name="ticks"):
+        """
+        Args:
+            widget: Any Tk widget (used for after/after_cancel)
+            interval_ms: Time between ticks in milliseconds
+            on_tick: Called with the tick index (0, 1, 2, ...)
+            ticks: Number of ticks before on_finish (None runs until cancel())
+            on_finish: Called once at start + ticks * interval (optional)
+            start: time.monotonic() of tick 0 (defaults to when start() is called)
+            late_threshold_ms: Ticks later than this are counted as late
+            name: Label used when logging timing stats
+        """
+        self.widget = widget
+        self.interval = interval_ms / 1000
+        self.on_tick = on_tick
+        self.ticks = ticks
+        self.on_finish = on_finish
+        self.start_time = start
+        self.late_threshold_ms = late_threshold_ms
+        self.name = name
+
+        self.index = 0
+        self.after_id = None
+        self.stats = {
+            'ticks': 0,
+            'late_ticks': 0,
+            'skipped_ticks': 0,
+            'last_drift_ms': 0.0,
+            'max_drift_ms': 0.0,
+            'total_drift_ms': 0.0
+        }
+
+    def start(self):
+        """Schedule tick 0 (at `start` if one was given, otherwise now)."""
+        if self.start_time is None:
+            self.start_time = time.monotonic()
+        self._schedule()
+        return self
+
+    def cancel(self):
+        """Stop ticking; on_finish is not called."""
+        if self.after_id is not None:
+            try:
+                self.widget.after_cancel(self.after_id)
+            except Exception:
+                pass
+            self.after_id = None
+
+    def get_stats(self):
+        """
+        Get timing metrics.
+
+        Returns:
+            dict: Tick counts plus last/max/average lateness in ms
+        """
+        stats = dict(self.stats)
+        fired = stats['ticks']
+        stats['average_drift_ms'] = round(stats.pop('total_drift_ms') / fired, 3) if fired else 0.0
+        return stats
+
+    def _deadline(self, index):
+        return self.start_time + index * self.interval
+
+    def _schedule(self):
+        self.after_id = schedule_at(self.widget, self._deadline(self.index), self._fire)
+
+    def _fire(self):
+        self.after_id = None
+        now = time.monotonic()
+        drift_ms = (now - self._deadline(self.index)) * 1000
+        self._record(drift_ms)
+
+        # Catch up if we are a whole interval (or more) behind
+        due = int((now - self.start_time) / self.interval)
+        if self.ticks is not None:
+            due = min(due, self.ticks)
+        if due > self.index:
+            self.stats['skipped_ticks'] += due - self.index
+            self.index = due
+
+        if self.ticks is not None and self.index >= self.ticks:
+            stats = self.get_stats()
+            logger.info(f"{self.name} finished: {stats['ticks']} ticks, {stats['late_ticks']} late, "
+                        f"{stats['skipped_ticks']} skipped, max drift {stats['max_drift_ms']} ms")
+            if self.on_finish:
+                self.on_finish()
+            return
+
+        self.on_tick(self.index)
+        self.index += 1
+        self._schedule()
+
+    def _record(self, drift_ms):
+        self.stats['ticks'] += 1
+        self.stats['last_drift_ms'] = round(drift_ms, 3)
+        self.stats['total_drift_ms'] += drift_ms
+        if drift_ms > self.stats['max_drift_ms']:
+            self.stats['max_drift_ms'] = round(drift_ms, 3)
+        if drift_ms > self.late_threshold_ms:
+            self.stats['late_ticks'] += 1
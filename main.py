@@ -1,29 +1,92 @@
-import sys
-import tkinter as tk
-import pygame
+import time
+PROCESS_START = time.perf_counter()
+
+import argparse
 import random
+import threading
+import importlib
+import tkinter as tk
 from frontend.splashscreen import splash_screen
-from frontend.player_entry.player_entry_component import PlayerEntryComponent
-from frontend.play_action_screen import PlayActionScreen
-from frontend.countdowntimer import CountdownTimer
+from frontend.frame_cache import FrameCache, DEFAULT_CACHE_DIR
+from frontend.tick_scheduler import schedule_at
+
+# countdown images 30-1, decoded and resized ahead of time while the splash and entry screens are up
+COUNTDOWN_IMAGES = [f"frontend/assets/{i}.tif" for i in range(30, 0, -1)]
+countdown_frames = None
+
+# Heavy modules imported on a background thread while the splash is showing
+# (anything not loaded by first use is simply imported then)
+PREWARM_MODULES = [
+    "frontend.api",
+    "frontend.player_entry.player_entry_component",
+    "frontend.play_action_screen",
+    "frontend.countdowntimer",
+]
+
+# Startup profile: (step, seconds) pairs, printed with --profile-startup
+startup_timings = [("python + tkinter/PIL imports", time.perf_counter() - PROCESS_START)]
+background_loaded = threading.Event()
+
+# pygame and the mixer are loaded in the background; music calls before then are skipped
+pygame = None
+music_ready = threading.Event()
+
+def timed_step(name, func, *args):
+    """Run one startup step and record how long it took"""
+    started = time.perf_counter()
+    result = func(*args)
+    startup_timings.append((name, time.perf_counter() - started))
+    return result
 
 # Music functions
 def init_music(track_number):
     """Initialize pygame mixer and load a specific track"""
-    pygame.mixer.init()
-    pygame.mixer.music.load(f"photon_tracks/Track0{track_number}.mp3")
+    global pygame
+    pygame = timed_step("import pygame", importlib.import_module, "pygame")
+    timed_step("pygame.mixer.init", pygame.mixer.init)
+    timed_step(f"load Track0{track_number}.mp3", pygame.mixer.music.load, f"photon_tracks/Track0{track_number}.mp3")
     pygame.mixer.music.set_volume(0.4)
+    music_ready.set()
 
 def start_music():
     """Start playing music in loop"""
+    if not music_ready.is_set():
+        print("Music not loaded yet - skipping")
+        return
     pygame.mixer.music.play(-1)  # -1 means loop indefinitely
 
 def stop_music():
     """Stop playing music"""
-    pygame.mixer.music.stop()
+    if music_ready.is_set():
+        pygame.mixer.music.stop()
+
+def load_in_background(track_number):
+    """Load the music and import the remaining screens without blocking the splash"""
+    try:
+        init_music(track_number)
+    except Exception as e:
+        print(f"Failed to initialize music: {e}")
+    for module in PREWARM_MODULES:
+        try:
+            timed_step(f"import {module}", importlib.import_module, module)
+        except Exception as e:
+            print(f"Failed to preload {module}: {e}")
+    background_loaded.set()
+
+def report_startup(window):
+    """Print the startup breakdown once the background loading has finished"""
+    if not background_loaded.is_set():
+        window.after(100, report_startup, window)
+        return
+    print("Startup profile:")
+    for name, seconds in startup_timings:
+        print(f"  {seconds * 1000:8.1f} ms  {name}")
+    print(f"  {(time.perf_counter() - PROCESS_START) * 1000:8.1f} ms  total until fully loaded")
 
 # start up the player entry screen
 def show_player_entry_screen(window):
+    from frontend.player_entry.player_entry_component import PlayerEntryComponent
+
     player_entry_screen = PlayerEntryComponent(window)
     player_entry_screen.pack(expand=True, fill="both")
 
@@ -34,6 +97,9 @@ def show_player_entry_screen(window):
         # Don't call start_game() here - it broadcasts 202 immediately!
         # We'll broadcast 202 AFTER the 30-second countdown finishes
         
+        from frontend.countdowntimer import CountdownTimer
+        from frontend.play_action_screen import PlayActionScreen
+
         # retrieve player names
         red_team_players = player_entry_screen.get_red_team_data()["players"]
         green_team_players = player_entry_screen.get_green_team_data()["players"]
@@ -41,14 +107,15 @@ def show_player_entry_screen(window):
         # hide player entry screen
         player_entry_screen.pack_forget()
 
-        # show countdown timer with images 30-1
-        countdown_images = [f"frontend/assets/{i}.tif" for i in range(30, 0, -1)]
-        
+        # Countdown, game clock and music cues all count from this one monotonic start time
+        countdown_start = time.monotonic()
+        game_start = countdown_start + len(COUNTDOWN_IMAGES)
+
         # Schedule music to start 15.4 seconds after countdown begins
-        window.after(15400, start_music)
+        schedule_at(window, countdown_start + 15.4, start_music)
         
         # Schedule music to stop after game ends (6 minutes + 30 seconds countdown + 3.5 seconds = 393.5 seconds)
-        window.after(393500, stop_music)
+        schedule_at(window, countdown_start + 393.5, stop_music)
         
         def show_play_action_after_countdown(window):
             # Countdown finished! Now load the play action screen first
@@ -63,46 +130,70 @@ def show_player_entry_screen(window):
                 # Show player entry screen again
                 show_player_entry_screen(window)
             
-            play_action = PlayActionScreen(window, red_team_players, green_team_players, return_callback=return_to_entry)
+            play_action = PlayActionScreen(window, red_team_players, green_team_players, return_callback=return_to_entry,
+                                           game_start=game_start)
             play_action.pack(expand=True, fill="both")
             
             # AFTER screen is loaded, broadcast code 202 to start traffic generator
             # Delay slightly to ensure screen is fully rendered
-            def broadcast_start():
-                try:
-                    import requests
-                    requests.post("http://localhost:5000/game/start", timeout=1)
+            def on_game_started(result):
+                if "error" in result:
+                    print(f"Failed to start game: {result['error']}")
+                else:
                     print("Game started - code 202 broadcasted")
-                except Exception as e:
-                    print(f"Failed to start game: {e}")
+            
+            # Sent on the play screen's network worker so a slow backend can't freeze the clock
+            def broadcast_start():
+                play_action.network.submit('start_game', 'start_game', callback=on_game_started)
             
             window.after(1150, broadcast_start)  # 1.15 second delay to ensure screen is ready
         
-        CountdownTimer(window, countdown_images, duration=1, next_screen=show_play_action_after_countdown)
+        # show countdown timer with images 30-1
+        CountdownTimer(window, COUNTDOWN_IMAGES, duration=1, next_screen=show_play_action_after_countdown,
+                       frame_cache=countdown_frames, start=countdown_start)
 
     # bind start game click
     player_entry_screen.start_button.config(command=start_play_action_screen)
 
 def main():
-    window = tk.Tk()
+    global countdown_frames
+
+    parser = argparse.ArgumentParser(description="Photon laser tag frontend")
+    parser.add_argument("duration", nargs="?", default="30",
+                        help="countdown duration in seconds (default 30)")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="print an import/initialization timing breakdown")
+    args = parser.parse_args()
+
+    time_duration = 30 # default for pressing start game
+    try:
+        time_duration = float(args.duration)
+    except ValueError:
+        print("Invalid duration argument. Using default 30 seconds.")
+
+    window = timed_step("create Tk window", tk.Tk)
     window.title("Photon - Player Entry")
     window.geometry("1300x800")
-    
-    # Initialize music with random track (1-8)
-    random_track = random.randint(1, 8)
-    init_music(random_track)
 
-    time_duration = 30 # default for pressing start game
-    if len(sys.argv) > 1:
-        try:
-            time_duration = float(sys.argv[1])
-        except ValueError:
-            print("Invalid duration argument. Using default 2 seconds.")
-    splash_images = [f"frontend/assets/{i}.tif" for i in range(31)]
+    # Show the splash first and paint it right away; everything else loads behind it
+    timed_step("build splash screen", splash_screen, window, show_player_entry_screen)
+    timed_step("first paint", window.update)
+    startup_timings.append(("time to splash", time.perf_counter() - PROCESS_START))
+
+    # Decode/resize the countdown frames in the background, then build the
+    # PhotoImages a few at a time on the Tk thread while the user enters players
+    countdown_frames = FrameCache(COUNTDOWN_IMAGES, cache_dir=DEFAULT_CACHE_DIR)
+    countdown_frames.preload()
+    window.after(3000, countdown_frames.realize, window)
+
+    # Initialize music with random track (1-8) and import the other screens in the background
+    random_track = random.randint(1, 8)
+    threading.Thread(target=load_in_background, args=(random_track,), daemon=True, name="startup-loader").start()
 
-    splash_screen(window, show_player_entry_screen)
+    if args.profile_startup:
+        report_startup(window)
 
     window.mainloop()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
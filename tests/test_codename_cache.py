@@ -0,0 +1,89 @@
+from backend import codename_cache
+from backend.codename_cache import CodenameCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_entries_expire_after_their_ttl(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(codename_cache.time, 'monotonic', clock)
+    cache = CodenameCache(ttl=60, negative_ttl=5)
+    cache.put(1, "Found")
+    cache.put(2, None)  # "not in the database"
+
+    clock.now += 4.9
+    assert cache.get(1) == (True, "Found") and cache.get(2) == (True, None)
+
+    clock.now += 0.2  # past the negative TTL only
+    assert cache.get(1) == (True, "Found") and cache.get(2) == (False, None)
+
+    clock.now += 60
+    assert cache.get(1) == (False, None)
+    stats = cache.get_stats()
+    assert stats['expirations'] == 2 and stats['size'] == 0
+    assert (stats['hits'], stats['negative_hits'], stats['misses']) == (2, 1, 2)
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = CodenameCache(max_size=2)
+    cache.put(1, "One")
+    cache.put(2, "Two")
+    assert cache.get(1) == (True, "One")  # 2 is now least recently used
+    cache.put(3, "Three")
+    assert cache.get(2) == (False, None)
+    assert cache.get(1) == (True, "One") and cache.get(3) == (True, "Three")
+    assert cache.get_stats()['evictions'] == 1
+
+
+def test_invalidate_and_clear():
+    cache = CodenameCache()
+    cache.put(1, "One")
+    cache.put(2, "Two")
+    cache.invalidate(1)
+    cache.invalidate(99)  # unknown IDs are not counted
+    assert cache.get(1) == (False, None) and cache.get(2) == (True, "Two")
+    cache.clear()
+    assert cache.get(2) == (False, None)
+    assert cache.get_stats()['invalidations'] == 2
+
+
+def test_fill_that_raced_a_clear_is_dropped():
+    """A lookup that read the row before an F12 clear must not re-cache it."""
+    cache = CodenameCache()
+    assert cache.get(7) == (False, None)
+    token = cache.token()  # miss: the SELECT starts here
+    cache.clear()          # clear_all_players lands while the SELECT is in flight
+    cache.put(7, "Deleted", token)
+    assert cache.get(7) == (False, None)
+    assert cache.get_stats()['stale_puts'] == 1
+
+
+def test_fill_that_raced_a_rename_is_dropped():
+    """A lookup that read the old codename must not overwrite the renamed one."""
+    cache = CodenameCache()
+    reader = cache.token()
+    cache.put_written({7: "New"}, cache.token())  # rename commits and fills the cache
+    cache.put(7, "Old", reader)
+    assert cache.get(7) == (True, "New")
+
+
+def test_write_fill_that_raced_a_clear_is_dropped():
+    cache = CodenameCache()
+    writer = cache.token()
+    cache.clear()
+    cache.put_written({7: "Written", 8: "Also"}, writer)
+    assert cache.get(7) == (False, None) and cache.get(8) == (False, None)
+
+
+def test_fill_without_intervening_invalidation_is_kept():
+    cache = CodenameCache()
+    token = cache.token()
+    cache.put(7, "Seven", token)
+    cache.put(8, None, token)
+    assert cache.get(7) == (True, "Seven") and cache.get(8) == (True, None)
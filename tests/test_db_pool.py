@@ -0,0 +1,151 @@
+import threading
+
+import pytest
+from psycopg2 import OperationalError, extensions
+
+from backend import db_pool
+from backend.db_pool import ConnectionPool, PoolTimeout
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, query, params=None):
+        if self.conn.broken:
+            raise OperationalError("server closed the connection")
+        self.conn.statements.append(query)
+        if not self.conn.autocommit:
+            self.conn.status = extensions.TRANSACTION_STATUS_INTRANS
+
+
+class FakeConnection:
+    def __init__(self):
+        self.closed = 0
+        self.autocommit = False
+        self.broken = False
+        self.status = extensions.TRANSACTION_STATUS_IDLE
+        self.statements = []
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def get_transaction_status(self):
+        return self.status
+
+    def commit(self):
+        self.statements.append("COMMIT")
+        self.status = extensions.TRANSACTION_STATUS_IDLE
+
+    def rollback(self):
+        self.statements.append("ROLLBACK")
+        self.status = extensions.TRANSACTION_STATUS_IDLE
+
+    def close(self):
+        self.closed = 1
+
+
+@pytest.fixture
+def connections(monkeypatch):
+    opened = []
+
+    def connect(**params):
+        conn = FakeConnection()
+        opened.append(conn)
+        return conn
+
+    monkeypatch.setattr(db_pool.psycopg2, 'connect', connect)
+    return opened
+
+
+def test_connections_are_reused_most_recent_first(connections):
+    pool = ConnectionPool({}, min_size=2, max_size=3)
+    pool.open()
+    assert len(connections) == 2
+
+    with pool.connection() as first:
+        with pool.connection() as second:
+            assert pool.get_stats()['in_use'] == 2
+    with pool.connection() as again:
+        assert again is first  # returned last, handed out first
+    assert len(connections) == 2
+
+    stats = pool.get_stats()
+    assert stats['checkouts'] == 3 and stats['peak_in_use'] == 2
+    assert stats['in_use'] == 0 and stats['idle'] == 2 and stats['size'] == 2
+
+
+def test_reads_are_one_round_trip(connections):
+    pool = ConnectionPool({}, min_size=1)
+    pool.open()
+    with pool.connection() as conn, conn.cursor() as cursor:
+        cursor.execute("SELECT codename FROM players WHERE id = %s", (1,))
+    assert connections[0].statements == ["SELECT codename FROM players WHERE id = %s"]
+
+
+def test_transaction_commits_or_rolls_back(connections):
+    pool = ConnectionPool({}, min_size=1)
+    pool.open()
+    conn = connections[0]
+
+    with pool.transaction() as tx, tx.cursor() as cursor:
+        cursor.execute("INSERT 1")
+        cursor.execute("INSERT 2")
+    assert conn.statements == ["INSERT 1", "INSERT 2", "COMMIT"] and conn.autocommit
+
+    conn.statements.clear()
+    with pytest.raises(ValueError):
+        with pool.transaction() as tx, tx.cursor() as cursor:
+            cursor.execute("INSERT 3")
+            raise ValueError("bad row")
+    assert conn.statements == ["INSERT 3", "ROLLBACK"] and conn.autocommit
+    assert pool.get_stats()['idle'] == 1  # an application error doesn't cost the connection
+
+
+def test_checkout_times_out_when_pool_is_exhausted(connections):
+    pool = ConnectionPool({}, min_size=0, max_size=1, checkout_timeout=0.05)
+    held = pool.getconn()
+    with pytest.raises(PoolTimeout):
+        pool.getconn()
+    stats = pool.get_stats()
+    assert stats['timeouts'] == 1 and stats['in_use'] == 1
+
+    # A waiter gets the connection as soon as it is returned
+    threading.Timer(0.05, pool.putconn, (held,)).start()
+    assert pool.getconn(timeout=5) is held
+    assert pool.get_stats()['max_wait_ms'] > 0
+
+
+def test_connection_errors_discard_the_connection(connections):
+    pool = ConnectionPool({}, min_size=1, max_size=2)
+    pool.open()
+    connections[0].broken = True
+
+    with pytest.raises(OperationalError):
+        with pool.connection() as conn, conn.cursor() as cursor:
+            cursor.execute("SELECT 1")
+    assert connections[0].closed
+
+    stats = pool.get_stats()
+    assert stats['connections_discarded'] == 1 and stats['size'] == 0 and stats['in_use'] == 0
+
+    with pool.connection() as conn:
+        assert conn is connections[1]  # a fresh one is opened on demand
+
+
+def test_stale_idle_connection_is_validated_before_reuse(connections):
+    pool = ConnectionPool({}, min_size=1, max_size=2, validate_after_seconds=0)
+    pool.open()
+    connections[0].broken = True
+
+    with pool.connection() as conn:
+        assert conn is connections[1]
+    stats = pool.get_stats()
+    assert stats['validation_failures'] == 1 and stats['connections_discarded'] == 1
+    assert stats['connections_opened'] == 2
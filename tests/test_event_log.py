@@ -0,0 +1,62 @@
+from backend.event_log import EventLog
+
+
+def fill(log, count):
+    for i in range(count):
+        log.add('hit', f"event {i}")
+
+
+def test_cursor_within_ring_returns_only_newer_events():
+    log = EventLog(capacity=10)
+    fill(log, 5)
+    events, missed, last_seq = log.since(3)
+    assert [e['seq'] for e in events] == [4, 5]
+    assert missed == 0 and last_seq == 5
+
+    events, missed, last_seq = log.since(5)
+    assert events == [] and missed == 0 and last_seq == 5
+
+
+def test_overwritten_events_are_counted_as_missed():
+    log = EventLog(capacity=4)
+    fill(log, 10)  # ring holds seq 7..10
+    events, missed, last_seq = log.since(2)
+    assert [e['seq'] for e in events] == [7, 8, 9, 10]
+    assert missed == 4  # seq 3..6 fell off the ring
+    assert last_seq == 10
+
+    # A cursor at the edge of the ring misses nothing
+    events, missed, _ = log.since(6)
+    assert [e['seq'] for e in events] == [7, 8, 9, 10] and missed == 0
+
+
+def test_clear_keeps_sequence_numbers_increasing():
+    log = EventLog(capacity=10)
+    fill(log, 3)
+    log.clear()
+    events, missed, last_seq = log.since(1)
+    assert events == [] and missed == 2 and last_seq == 3
+
+    event = log.add('game_reset', "reset")
+    assert event['seq'] == 4
+    events, missed, last_seq = log.since(3)
+    assert [e['seq'] for e in events] == [4] and missed == 0 and last_seq == 4
+    # A cursor from before the clear reports what it can no longer get
+    events, missed, _ = log.since(1)
+    assert [e['seq'] for e in events] == [4] and missed == 2
+
+
+def test_cursor_ahead_of_last_seq_gets_everything():
+    """A cursor from before a server restart is ahead of the new log: resend it all."""
+    log = EventLog(capacity=10)
+    fill(log, 3)
+    events, missed, last_seq = log.since(500)
+    assert [e['seq'] for e in events] == [1, 2, 3]
+    assert missed == 0 and last_seq == 3
+
+
+def test_wait_for_events_returns_immediately_when_behind():
+    log = EventLog(capacity=10)
+    fill(log, 1)
+    assert log.wait_for_events(0, timeout=5)
+    assert not log.wait_for_events(1, timeout=0.01)
@@ -0,0 +1,72 @@
+import random
+
+from backend.game_state import GameState
+
+
+def test_aggregates_survive_random_mutations():
+    """Running totals, counts and leaderboards must always match a full recount."""
+    rng = random.Random(1234)
+    state = GameState()
+    equipment_ids = list(range(1, 21))
+
+    for step in range(5000):
+        action = rng.random()
+        if action < 0.15:
+            # New player or re-registration of equipment already in use
+            equipment_id = rng.choice(equipment_ids)
+            state.add_player(equipment_id, equipment_id, f"Player {equipment_id}", rng.choice(['red', 'green']))
+        elif action < 0.85:
+            hit_id = rng.choice(equipment_ids + [43, 53])
+            state.apply_hit(rng.choice(equipment_ids), hit_id)
+        elif action < 0.95:
+            state.update_score(rng.choice(equipment_ids), rng.choice([-10, 10, 100]))
+        elif action < 0.98:
+            state.reset_game()
+        else:
+            state.clear_all_players()
+
+        assert state.check_aggregates(), f"aggregates out of sync after step {step}"
+
+
+def test_version_from_before_restart_gets_full_scoreboard():
+    """A version number is only meaningful within the epoch (process) that issued it."""
+    old = GameState()
+    old.add_player(1, 1, "Old One", "red")
+    old.add_player(2, 2, "Old Two", "green")
+    board = old.get_scoreboard_since(None)
+
+    restarted = GameState()
+    for equipment_id in (7, 8, 9):
+        restarted.add_player(equipment_id, equipment_id, f"Player {equipment_id}", "red")
+
+    # Same version number, different epoch: must not be treated as "unchanged"
+    stale = restarted.get_scoreboard_since(restarted.version, board['epoch'])
+    assert stale['full'] and [p['equipment_id'] for p in stale['red_team']['players']] == [7, 8, 9]
+
+    # Lower version number, different epoch: must not be treated as a delta
+    assert restarted.get_scoreboard_since(board['version'], board['epoch'])['full']
+
+    # Same epoch still gets deltas and "unchanged"
+    current = restarted.get_scoreboard_since(None)
+    assert restarted.get_scoreboard_since(current['version'], current['epoch']) is None
+    restarted.update_score(8, 10)
+    delta = restarted.get_scoreboard_since(current['version'], current['epoch'])
+    assert not delta['full'] and [p['equipment_id'] for p in delta['red_team']['players']] == [8]
+
+
+def test_failed_registration_leaves_state_unchanged():
+    """An equipment ID that can't be ordered in the leaderboard must not half-register."""
+    state = GameState()
+    state.add_player(1, 1, "One", "red")
+    version = state.version
+
+    try:
+        state.add_player("101", 2, "Two", "red")
+    except TypeError:
+        pass
+    else:
+        raise AssertionError("mixed equipment ID types should not be orderable")
+
+    assert state.version == version
+    assert state.team_counts == {'red': 1} and "101" not in state.players
+    assert state.check_aggregates()